@@ -3,330 +3,473 @@ AST (Abstract Syntax Tree) nodes for Sharp Programming Language.
 """
 
 from dataclasses import dataclass
-from typing import List, Optional, Any, Union
+from enum import IntEnum
+from typing import TYPE_CHECKING, ClassVar, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Any, Union
+
+if TYPE_CHECKING:
+    from ast_nodes_rare import Decorator
+
+# Operators
+class Operator(IntEnum):
+    """Operator codes for BinaryOp, UnaryOp and augmented Assignment.
+
+    Binary operators come first and are numbered from 0 so the interpreter
+    can index its dispatch table directly with the code.
+    """
+    ADD = 0
+    SUB = 1
+    MUL = 2
+    DIV = 3
+    MOD = 4
+    POW = 5
+    EQ = 6
+    NE = 7
+    LT = 8
+    LE = 9
+    GT = 10
+    GE = 11
+    IN = 12
+    BIT_AND = 13
+    BIT_OR = 14
+    BIT_XOR = 15
+    LSHIFT = 16
+    RSHIFT = 17
+    # Short-circuit operators
+    AND = 18
+    OR = 19
+    # Unary operators
+    NOT = 20
+    POS = 21
+    NEG = 22
+    INVERT = 23
+
+    def __str__(self) -> str:
+        return OPERATOR_SYMBOLS[self]
+
+# Source spelling of each Operator, indexed by code
+OPERATOR_SYMBOLS = (
+    '+', '-', '*', '/', '%', '**', '==', '!=', '<', '<=', '>', '>=', 'in',
+    '&', '|', '^', '<<', '>>', 'and', 'or', 'not', '+', '-', '~',
+)
 
 # Base node
-@dataclass
 class ASTNode:
-    pass
+    """Base class for all AST nodes.
+
+    Nodes are slotted dataclasses: ``__slots__ = ()`` here keeps subclasses
+    free of a per-instance ``__dict__``. Literals, names and operator nodes
+    are frozen so NodeBuilder can share them between parents.
+
+    Each class lists the fields holding child nodes in ``_child_attrs`` so
+    walkers can use iter_children() instead of inspecting dataclass fields.
+
+    The dataclass field order is also the ``__match_args__`` order, so code
+    that uses ``match`` should use positional patterns such as
+    ``case BinaryOp(left, op, right):``. Keep the fields that are matched
+    most often first, and only add new fields at the end with a default.
+    """
+    __slots__ = ()
+    _child_attrs: ClassVar[Tuple[str, ...]] = ()
+
+    def iter_children(self) -> Iterator['ASTNode']:
+        """Yield the direct child nodes in field order, flattening sequences."""
+        for attr in self._child_attrs:
+            value = getattr(self, attr)
+            if type(value) is tuple or type(value) is list:
+                for child in value:
+                    if child is not None:
+                        yield child
+            elif value is not None:
+                yield value
 
 # Literals
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IntLiteral(ASTNode):
     value: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FloatLiteral(ASTNode):
     value: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StringLiteral(ASTNode):
     value: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BoolLiteral(ASTNode):
     value: bool
+    TRUE: ClassVar['BoolLiteral']
+    FALSE: ClassVar['BoolLiteral']
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NilLiteral(ASTNode):
     pass
 
+# Shared literal instances (literals are immutable, so one object serves every use)
+_SMALL_INTS = {i: IntLiteral(i) for i in range(-5, 257)}
+BoolLiteral.TRUE = BoolLiteral(True)
+BoolLiteral.FALSE = BoolLiteral(False)
+NIL = NilLiteral()
+
+def mk_int(value: int) -> IntLiteral:
+    """Return an IntLiteral, reusing the cached node for small values."""
+    node = _SMALL_INTS.get(value)
+    return node if node is not None else IntLiteral(value)
+
+def mk_bool(value: bool) -> BoolLiteral:
+    """Return the shared true/false literal."""
+    return BoolLiteral.TRUE if value else BoolLiteral.FALSE
+
 # Collections
-@dataclass
+@dataclass(slots=True)
 class ListLiteral(ASTNode):
     elements: List[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('elements',)
 
-@dataclass
+@dataclass(slots=True)
+class DictPair(ASTNode):
+    key: ASTNode
+    value: ASTNode
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('key', 'value')
+
+@dataclass(slots=True)
 class DictLiteral(ASTNode):
-    pairs: List[tuple]  # List of (key, value) tuples
+    pairs: List[DictPair]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('pairs',)
 
-@dataclass
+@dataclass(slots=True)
 class TupleLiteral(ASTNode):
     elements: List[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('elements',)
 
 # Identifiers and Variables
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Identifier(ASTNode):
     name: str
 
-@dataclass
-class VarDecl(ASTNode):
-    name: str
-    value: ASTNode
-
 # Operations
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BinaryOp(ASTNode):
     left: ASTNode
-    op: str
+    op: Operator
     right: ASTNode
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('left', 'right')
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UnaryOp(ASTNode):
-    op: str
+    op: Operator
     operand: ASTNode
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('operand',)
+
+class AssignKind(IntEnum):
+    """How an Assignment binds its targets; indexes the interpreter's handlers."""
+    DECLARE = 0    # let x = value (define in the current scope)
+    ASSIGN = 1     # x = value (set through enclosing scopes)
+    AUGMENTED = 2  # x += value
+    UNPACK = 3     # a, b, *rest = value
 
-@dataclass
+@dataclass(slots=True)
 class Assignment(ASTNode):
-    target: str
+    kind: AssignKind
+    targets: Tuple[str, ...]
     value: ASTNode
+    op: Optional[Operator] = None  # AUGMENTED only
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('value',)
 
-@dataclass
-class AugmentedAssignment(ASTNode):
-    target: str
-    op: str
-    value: ASTNode
+    @property
+    def target(self) -> str:
+        """The only target of a non-unpacking assignment."""
+        return self.targets[0]
 
 # Functions
-@dataclass
+@dataclass(slots=True)
 class FunctionDef(ASTNode):
     name: str
     params: List[str]
     defaults: List[Optional[ASTNode]]
-    body: List[ASTNode]
-
-@dataclass
+    body: Tuple[ASTNode, ...]
+    param_types: Optional[Tuple[Optional[str], ...]] = None  # Type annotations for params
+    return_type: Optional[str] = None
+    is_async: bool = False
+    decorators: Tuple['Decorator', ...] = ()
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('decorators', 'defaults', 'body')
+
+@dataclass(slots=True)
 class FunctionCall(ASTNode):
     func: ASTNode
     args: List[ASTNode]
-    kwargs: dict
+    kw_names: Tuple[str, ...] = ()
+    kw_values: Tuple[ASTNode, ...] = ()
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('func', 'args', 'kw_values')
 
-@dataclass
+@dataclass(slots=True)
 class Lambda(ASTNode):
     params: List[str]
     body: ASTNode
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('body',)
 
 # Control Flow
-@dataclass
+@dataclass(slots=True)
+class ElifPart(ASTNode):
+    condition: ASTNode
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('condition', 'body')
+
+@dataclass(slots=True)
 class IfExpr(ASTNode):
     condition: ASTNode
-    then_body: List[ASTNode]
-    elif_parts: List[tuple]  # List of (condition, body) tuples
-    else_body: Optional[List[ASTNode]]
+    then_body: Tuple[ASTNode, ...]
+    elif_parts: List[ElifPart]
+    else_body: Optional[Tuple[ASTNode, ...]]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('condition', 'then_body', 'elif_parts', 'else_body')
 
-@dataclass
+@dataclass(slots=True)
 class WhileLoop(ASTNode):
     condition: ASTNode
-    body: List[ASTNode]
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('condition', 'body')
 
-@dataclass
+@dataclass(slots=True)
 class ForLoop(ASTNode):
     target: str
     iterable: ASTNode
-    body: List[ASTNode]
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('iterable', 'body')
 
-@dataclass
+@dataclass(slots=True)
+class MatchCase(ASTNode):
+    pattern: ASTNode
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('pattern', 'body')
+
+@dataclass(slots=True)
 class MatchExpr(ASTNode):
     value: ASTNode
-    cases: List[tuple]  # List of (pattern, body) tuples
+    cases: List[MatchCase]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('value', 'cases')
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt(ASTNode):
     value: Optional[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('value',)
 
-@dataclass
+@dataclass(slots=True)
 class BreakStmt(ASTNode):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class ContinueStmt(ASTNode):
     pass
 
 # Index and Attribute access
-@dataclass
+@dataclass(slots=True, frozen=True)
 class IndexAccess(ASTNode):
     obj: ASTNode
     index: ASTNode
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('obj', 'index')
 
-@dataclass
+@dataclass(slots=True)
 class SliceAccess(ASTNode):
     obj: ASTNode
     start: Optional[ASTNode]
     end: Optional[ASTNode]
     step: Optional[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('obj', 'start', 'end', 'step')
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AttributeAccess(ASTNode):
     obj: ASTNode
     attr: str
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('obj',)
 
 # List comprehension
-@dataclass
+@dataclass(slots=True)
 class ListComprehension(ASTNode):
     expr: ASTNode
     target: str
     iterable: ASTNode
     condition: Optional[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('expr', 'iterable', 'condition')
 
-@dataclass
+@dataclass(slots=True)
 class DictComprehension(ASTNode):
     key: ASTNode
     value: ASTNode
     target: str
     iterable: ASTNode
     condition: Optional[ASTNode]
-
-# Type declarations
-@dataclass
-class TypeDef(ASTNode):
-    name: str
-    variants: List[tuple]  # List of (variant_name, fields) tuples
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('key', 'value', 'iterable', 'condition')
 
 # Imports
-@dataclass
+@dataclass(slots=True)
 class ImportStmt(ASTNode):
     module: str
     items: Optional[List[str]]
     alias: Optional[str]
 
-@dataclass
+@dataclass(slots=True)
+class ImportItem(ASTNode):
+    name: str
+    alias: Optional[str]
+
+@dataclass(slots=True)
 class FromImportStmt(ASTNode):
     module: str
-    items: List[tuple]  # List of (name, alias) tuples
+    items: List[ImportItem]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('items',)
 
 # Program
-@dataclass
+@dataclass(slots=True)
 class Program(ASTNode):
-    statements: List[ASTNode]
+    statements: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('statements',)
 
 # Pass statement
-@dataclass
+@dataclass(slots=True)
 class PassStmt(ASTNode):
     pass
 # Classes and OOP
-@dataclass
+@dataclass(slots=True)
 class ClassDef(ASTNode):
     name: str
     bases: List[str]  # Base class names
-    body: List[ASTNode]
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('body',)
 
-@dataclass
-class MethodDef(ASTNode):
-    name: str
-    params: List[str]
-    defaults: List[Optional[ASTNode]]
-    body: List[ASTNode]
-    decorators: List[str]  # List of decorator names
-
-@dataclass
+@dataclass(slots=True)
 class SelfRef(ASTNode):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class SuperCall(ASTNode):
     args: List[ASTNode]
-
-# Decorators
-@dataclass
-class Decorator(ASTNode):
-    name: str
-    args: List[ASTNode]
-
-@dataclass
-class DecoratedFunction(ASTNode):
-    decorators: List[ASTNode]  # List of Decorator nodes
-    func: FunctionDef
-
-@dataclass
-class DecoratedClass(ASTNode):
-    decorators: List[ASTNode]  # List of Decorator nodes
-    cls: 'ClassDef'
-
-# Type Annotations
-@dataclass
-class TypeAnnotation(ASTNode):
-    name: str
-    annotation: str  # Type annotation as string
-
-@dataclass
-class FunctionDefWithTypes(ASTNode):
-    name: str
-    params: List[str]
-    param_types: List[Optional[str]]  # Type annotations for params
-    return_type: Optional[str]
-    defaults: List[Optional[ASTNode]]
-    body: List[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('args',)
 
 # Exception Handling
-@dataclass
+@dataclass(slots=True)
 class TryStmt(ASTNode):
-    body: List[ASTNode]
+    body: Tuple[ASTNode, ...]
     except_handlers: List['ExceptHandler']  # List of except clauses
-    else_body: Optional[List[ASTNode]]  # Else clause (if no exception)
-    finally_body: Optional[List[ASTNode]]  # Finally clause (always runs)
+    else_body: Optional[Tuple[ASTNode, ...]]  # Else clause (if no exception)
+    finally_body: Optional[Tuple[ASTNode, ...]]  # Finally clause (always runs)
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('body', 'except_handlers', 'else_body', 'finally_body')
 
-@dataclass
+@dataclass(slots=True)
 class ExceptHandler(ASTNode):
     exception_type: Optional[str]  # None means catch-all
     var_name: Optional[str]  # Variable name to bind exception
-    body: List[ASTNode]
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('body',)
 
-@dataclass
+@dataclass(slots=True)
 class RaiseStmt(ASTNode):
     exception: Optional[ASTNode]  # Exception to raise
     cause: Optional[ASTNode]  # Cause (from clause)
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('exception', 'cause')
 
-@dataclass
+@dataclass(slots=True)
 class WithStmt(ASTNode):
     context_var: Optional[str]
     context_expr: ASTNode
-    body: List[ASTNode]
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('context_expr', 'body')
 
 # Generators
-@dataclass
+@dataclass(slots=True)
 class YieldStmt(ASTNode):
     value: Optional[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('value',)
 
-@dataclass
+@dataclass(slots=True)
 class GeneratorExpr(ASTNode):
     expr: ASTNode
     target: str
     iterable: ASTNode
     condition: Optional[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('expr', 'iterable', 'condition')
 
 # Async/Await
-@dataclass
-class AsyncFunctionDef(ASTNode):
-    name: str
-    params: List[str]
-    defaults: List[Optional[ASTNode]]
-    body: List[ASTNode]
-
-@dataclass
+@dataclass(slots=True)
 class AwaitExpr(ASTNode):
     value: ASTNode
-
-@dataclass
-class AsyncForLoop(ASTNode):
-    target: str
-    iterable: ASTNode
-    body: List[ASTNode]
-
-@dataclass
-class AsyncWithStmt(ASTNode):
-    context_var: Optional[str]
-    context_expr: ASTNode
-    body: List[ASTNode]
-
-# *args and **kwargs
-@dataclass
-class VarArgs(ASTNode):
-    args: List[ASTNode]  # Arguments list
-    kwargs: dict  # Keyword arguments
-
-# Unpacking
-@dataclass
-class UnpackingAssignment(ASTNode):
-    targets: List[str]  # a, b, *rest = values
-    values: ASTNode
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('value',)
 
 # Scope modifiers
-@dataclass
+@dataclass(slots=True)
 class GlobalStmt(ASTNode):
     """Global statement: global x, y, z"""
     names: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class NonlocalStmt(ASTNode):
     """Nonlocal statement: nonlocal x, y"""
-    names: List[str]
\ No newline at end of file
+    names: List[str]
+
+# Rarely used nodes live in ast_nodes_rare and are loaded on first access
+_RARE_NODES = frozenset({
+    'TypeVariant', 'TypeDef', 'Decorator', 'DecoratedClass', 'TypeAnnotation',
+    'AsyncForLoop', 'AsyncWithStmt', 'VarArgs',
+})
+
+def __getattr__(name: str) -> Any:
+    """Resolve rare node classes lazily (PEP 562)."""
+    if name in _RARE_NODES:
+        import ast_nodes_rare
+        cls = globals()[name] = getattr(ast_nodes_rare, name)
+        return cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Node construction
+_N = TypeVar('_N', bound=ASTNode)
+
+class NodeBuilder:
+    """Hash-consing factory for frozen expression nodes.
+
+    Structurally identical nodes built through one builder are the same
+    object, so repeated names, literals and subexpressions are shared.
+    Children are keyed by ``id()``; that is safe because the cached parent
+    keeps its children alive.
+    """
+    __slots__ = ('_cache',)
+
+    def __init__(self):
+        self._cache: Dict[tuple, ASTNode] = {}
+
+    def _get(self, key: tuple, cls: Type[_N], *fields: Any) -> _N:
+        node = self._cache.get(key)
+        if node is None:
+            node = self._cache[key] = cls(*fields)
+        return node  # type: ignore[return-value]
+
+    def int_lit(self, value: int) -> IntLiteral:
+        node = _SMALL_INTS.get(value)
+        if node is not None:
+            return node
+        return self._get((IntLiteral, value), IntLiteral, value)
+
+    def float_lit(self, value: float) -> FloatLiteral:
+        return self._get((FloatLiteral, value), FloatLiteral, value)
+
+    def string_lit(self, value: str) -> StringLiteral:
+        return self._get((StringLiteral, value), StringLiteral, value)
+
+    def bool_lit(self, value: bool) -> BoolLiteral:
+        return mk_bool(value)
+
+    def nil_lit(self) -> NilLiteral:
+        return NIL
+
+    def identifier(self, name: str) -> Identifier:
+        return self._get((Identifier, name), Identifier, name)
+
+    def binary_op(self, left: ASTNode, op: Operator, right: ASTNode) -> BinaryOp:
+        return self._get((BinaryOp, id(left), op, id(right)), BinaryOp, left, op, right)
+
+    def unary_op(self, op: Operator, operand: ASTNode) -> UnaryOp:
+        return self._get((UnaryOp, op, id(operand)), UnaryOp, op, operand)
+
+    def index(self, obj: ASTNode, index: ASTNode) -> IndexAccess:
+        return self._get((IndexAccess, id(obj), id(index)), IndexAccess, obj, index)
+
+    def attribute(self, obj: ASTNode, attr: str) -> AttributeAccess:
+        return self._get((AttributeAccess, id(obj), attr), AttributeAccess, obj, attr)
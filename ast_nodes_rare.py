@@ -0,0 +1,65 @@
+"""
+Rarely used AST nodes for Sharp Programming Language.
+
+These are split out of ast_nodes so the common import path does not pay to
+create them. Import them from ast_nodes as usual; its module ``__getattr__``
+loads this file the first time one of them is used.
+"""
+
+from dataclasses import dataclass
+from typing import ClassVar, List, Optional, Tuple
+from ast_nodes import ASTNode, ClassDef
+
+# Type declarations
+@dataclass(slots=True)
+class TypeVariant(ASTNode):
+    name: str
+    fields: List[str]
+
+@dataclass(slots=True)
+class TypeDef(ASTNode):
+    name: str
+    variants: List[TypeVariant]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('variants',)
+
+# Decorators
+@dataclass(slots=True)
+class Decorator(ASTNode):
+    name: str
+    args: List[ASTNode]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('args',)
+
+@dataclass(slots=True)
+class DecoratedClass(ASTNode):
+    decorators: List[ASTNode]  # List of Decorator nodes
+    cls: ClassDef
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('decorators', 'cls')
+
+# Type Annotations
+@dataclass(slots=True)
+class TypeAnnotation(ASTNode):
+    name: str
+    annotation: str  # Type annotation as string
+
+# Async
+@dataclass(slots=True)
+class AsyncForLoop(ASTNode):
+    target: str
+    iterable: ASTNode
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('iterable', 'body')
+
+@dataclass(slots=True)
+class AsyncWithStmt(ASTNode):
+    context_var: Optional[str]
+    context_expr: ASTNode
+    body: Tuple[ASTNode, ...]
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('context_expr', 'body')
+
+# *args and **kwargs
+@dataclass(slots=True)
+class VarArgs(ASTNode):
+    args: List[ASTNode]  # Arguments list
+    kw_names: Tuple[str, ...] = ()  # Keyword argument names
+    kw_values: Tuple[ASTNode, ...] = ()  # Keyword argument values
+    _child_attrs: ClassVar[Tuple[str, ...]] = ('args', 'kw_values')
@@ -0,0 +1,541 @@
+"""
+Bytecode compiler and virtual machine for Sharp Programming Language.
+Compiles the AST into flat instruction arrays and executes them in a loop.
+"""
+
+from array import array
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+from ast_nodes import *
+from interpreter import Interpreter, Environment, ProgramInterrupted, BINARY_OPERATIONS, UNARY_OPERATIONS
+from stdlib import SharpFunction, SharpNil, ReturnValue, BreakException, ContinueException
+
+class Op(IntEnum):
+    """Bytecode instructions. Every instruction is an ``(op, arg)`` pair."""
+    LOAD_CONST = 0
+    LOAD_NIL = 1
+    LOAD_NAME = 2
+    STORE_NAME = 3              # Define in the current scope (let)
+    SET_NAME = 4                # Assign through enclosing scopes
+    POP = 5
+    BINARY_OP = 6               # arg: Operator
+    UNARY_OP = 7                # arg: Operator
+    NOT = 8
+    JUMP = 9
+    POP_JUMP_IF_FALSE = 10
+    JUMP_IF_FALSE_OR_POP = 11
+    JUMP_IF_TRUE_OR_POP = 12
+    BUILD_LIST = 13
+    BUILD_TUPLE = 14
+    BUILD_DICT = 15             # arg: number of key/value pairs
+    INDEX = 16
+    LOAD_ATTR = 17
+    CALL = 18                   # arg: positional argument count
+    CALL_KW = 19                # arg: positional count; keyword names on top of stack
+    MAKE_FUNCTION = 20          # arg: const index of a (FunctionDef, CodeObject) pair
+    RETURN_VALUE = 21
+    GET_ITER = 22
+    FOR_ITER = 23               # arg: jump target once the iterator is exhausted
+    SETUP_LOOP = 24             # arg: index into CodeObject.loops
+    POP_LOOP = 25
+    BREAK_LOOP = 26
+    CONTINUE_LOOP = 27
+    EVAL = 28                   # arg: const index of a node for the tree walker
+
+# Plain int opcodes for the dispatch loop (cheaper to compare than Op members)
+LOAD_CONST = int(Op.LOAD_CONST)
+LOAD_NIL = int(Op.LOAD_NIL)
+LOAD_NAME = int(Op.LOAD_NAME)
+STORE_NAME = int(Op.STORE_NAME)
+SET_NAME = int(Op.SET_NAME)
+POP = int(Op.POP)
+BINARY_OP = int(Op.BINARY_OP)
+UNARY_OP = int(Op.UNARY_OP)
+NOT = int(Op.NOT)
+JUMP = int(Op.JUMP)
+POP_JUMP_IF_FALSE = int(Op.POP_JUMP_IF_FALSE)
+JUMP_IF_FALSE_OR_POP = int(Op.JUMP_IF_FALSE_OR_POP)
+JUMP_IF_TRUE_OR_POP = int(Op.JUMP_IF_TRUE_OR_POP)
+BUILD_LIST = int(Op.BUILD_LIST)
+BUILD_TUPLE = int(Op.BUILD_TUPLE)
+BUILD_DICT = int(Op.BUILD_DICT)
+INDEX = int(Op.INDEX)
+LOAD_ATTR = int(Op.LOAD_ATTR)
+CALL = int(Op.CALL)
+CALL_KW = int(Op.CALL_KW)
+MAKE_FUNCTION = int(Op.MAKE_FUNCTION)
+RETURN_VALUE = int(Op.RETURN_VALUE)
+GET_ITER = int(Op.GET_ITER)
+FOR_ITER = int(Op.FOR_ITER)
+SETUP_LOOP = int(Op.SETUP_LOOP)
+POP_LOOP = int(Op.POP_LOOP)
+BREAK_LOOP = int(Op.BREAK_LOOP)
+CONTINUE_LOOP = int(Op.CONTINUE_LOOP)
+EVAL = int(Op.EVAL)
+
+# Nodes that only appear as statements; anything else is an expression
+STATEMENT_NODES = (
+    Assignment, FunctionDef, IfExpr, WhileLoop, ForLoop,
+    ReturnStmt, BreakStmt, ContinueStmt, PassStmt,
+)
+
+class CodeObject:
+    """Compiled instructions for a program or function body."""
+    __slots__ = ('name', 'code', 'consts', 'names', 'loops')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.code = array('i')
+        self.consts: List[Any] = []
+        self.names: List[str] = []
+        # (continue_ip, break_ip, continue_depth) per loop
+        self.loops: List[tuple] = []
+
+    def disassemble(self) -> str:
+        """Return a readable listing of the instructions."""
+        lines = []
+        for ip in range(0, len(self.code), 2):
+            op = Op(self.code[ip])
+            arg = self.code[ip + 1]
+            if op in (Op.LOAD_NAME, Op.STORE_NAME, Op.SET_NAME, Op.LOAD_ATTR):
+                detail = self.names[arg]
+            elif op in (Op.LOAD_CONST, Op.EVAL):
+                detail = repr(self.consts[arg])
+            elif op in (Op.BINARY_OP, Op.UNARY_OP):
+                detail = str(Operator(arg))
+            else:
+                detail = str(arg)
+            lines.append(f"{ip:5d} {op.name:<22} {detail}")
+        return "\n".join(lines)
+
+class Compiler:
+    """Compiles AST nodes into a CodeObject.
+
+    Nodes without a bytecode form compile to an EVAL instruction that hands
+    the node to the tree-walking interpreter, so every program compiles.
+    """
+
+    def __init__(self, name: str = '<program>', in_function: bool = False):
+        self.co = CodeObject(name)
+        self.in_function = in_function
+        self.loop_depth = 0
+        self._const_ids: Dict[tuple, int] = {}
+        self._name_ids: Dict[str, int] = {}
+
+    @classmethod
+    def compile_program(cls, program: Program) -> CodeObject:
+        """Compile a whole program."""
+        compiler = cls()
+        compiler.compile_body(program.statements)
+        return compiler.co
+
+    @classmethod
+    def compile_function(cls, node: FunctionDef) -> CodeObject:
+        """Compile a function body."""
+        compiler = cls(node.name, in_function=True)
+        compiler.compile_body(node.body)
+        return compiler.co
+
+    def emit(self, op: Op, arg: int = 0) -> int:
+        """Append an instruction and return its position."""
+        pos = len(self.co.code)
+        self.co.code.append(op)
+        self.co.code.append(arg)
+        return pos
+
+    def patch(self, pos: int):
+        """Point the jump at ``pos`` to the next instruction."""
+        self.co.code[pos + 1] = len(self.co.code)
+
+    def const(self, value: Any, shared: bool = True) -> int:
+        """Return the constant table index for ``value``."""
+        key = (type(value), value)
+        if shared and key in self._const_ids:
+            return self._const_ids[key]
+        self.co.consts.append(value)
+        index = len(self.co.consts) - 1
+        if shared:
+            self._const_ids[key] = index
+        return index
+
+    def name(self, name: str) -> int:
+        """Return the name table index for ``name``."""
+        index = self._name_ids.get(name)
+        if index is None:
+            index = len(self.co.names)
+            self.co.names.append(name)
+            self._name_ids[name] = index
+        return index
+
+    def compile_body(self, body: List[ASTNode]):
+        """Compile a statement list ending in a return.
+
+        Like the tree walker, a function returns the value of its last
+        statement when that statement is an expression.
+        """
+        for i, stmt in enumerate(body):
+            if self.in_function and i == len(body) - 1 and not isinstance(stmt, STATEMENT_NODES):
+                self.expr(stmt)
+                self.emit(Op.RETURN_VALUE)
+                return
+            self.stmt(stmt)
+        self.emit(Op.LOAD_NIL)
+        self.emit(Op.RETURN_VALUE)
+
+    def block(self, body: List[ASTNode]):
+        """Compile a nested statement list."""
+        for stmt in body:
+            self.stmt(stmt)
+
+    def stmt(self, node: ASTNode):
+        """Compile a statement, leaving the stack unchanged."""
+        if isinstance(node, Assignment) and node.kind <= AssignKind.ASSIGN:
+            self.expr(node.value)
+            store = Op.STORE_NAME if node.kind == AssignKind.DECLARE else Op.SET_NAME
+            self.emit(store, self.name(node.targets[0]))
+
+        elif isinstance(node, FunctionDef) and not node.decorators:
+            func = (node, Compiler.compile_function(node))
+            self.emit(Op.MAKE_FUNCTION, self.const(func, shared=False))
+            self.emit(Op.STORE_NAME, self.name(node.name))
+
+        elif isinstance(node, ReturnStmt) and self.in_function:
+            if node.value:
+                self.expr(node.value)
+            else:
+                self.emit(Op.LOAD_NIL)
+            self.emit(Op.RETURN_VALUE)
+
+        elif isinstance(node, IfExpr):
+            end_jumps = []
+            branches = [(node.condition, node.then_body)]
+            branches.extend((part.condition, part.body) for part in node.elif_parts)
+            for condition, body in branches:
+                self.expr(condition)
+                skip = self.emit(Op.POP_JUMP_IF_FALSE)
+                self.block(body)
+                end_jumps.append(self.emit(Op.JUMP))
+                self.patch(skip)
+            if node.else_body:
+                self.block(node.else_body)
+            for jump in end_jumps:
+                self.patch(jump)
+
+        elif isinstance(node, WhileLoop):
+            loop = self.begin_loop()
+            head = len(self.co.code)
+            self.expr(node.condition)
+            exit_jump = self.emit(Op.POP_JUMP_IF_FALSE)
+            self.loop_body(node.body)
+            self.emit(Op.JUMP, head)
+            self.patch(exit_jump)
+            self.end_loop(loop, head, 0)
+
+        elif isinstance(node, ForLoop):
+            loop = self.begin_loop()
+            self.expr(node.iterable)
+            self.emit(Op.GET_ITER)
+            head = self.emit(Op.FOR_ITER)
+            self.emit(Op.SET_NAME, self.name(node.target))
+            self.loop_body(node.body)
+            self.emit(Op.JUMP, head)
+            self.patch(head)
+            # Continue keeps the iterator on the stack
+            self.end_loop(loop, head, 1)
+
+        elif isinstance(node, BreakStmt) and self.loop_depth:
+            self.emit(Op.BREAK_LOOP)
+
+        elif isinstance(node, ContinueStmt) and self.loop_depth:
+            self.emit(Op.CONTINUE_LOOP)
+
+        elif isinstance(node, PassStmt):
+            pass
+
+        else:
+            self.expr(node)
+            self.emit(Op.POP)
+
+    def begin_loop(self) -> int:
+        """Start a loop; its jump targets are filled in by end_loop."""
+        index = len(self.co.loops)
+        self.co.loops.append(None)
+        self.emit(Op.SETUP_LOOP, index)
+        return index
+
+    def loop_body(self, body: List[ASTNode]):
+        self.loop_depth += 1
+        self.block(body)
+        self.loop_depth -= 1
+
+    def end_loop(self, index: int, continue_ip: int, continue_depth: int):
+        self.co.loops[index] = (continue_ip, len(self.co.code), continue_depth)
+        self.emit(Op.POP_LOOP)
+
+    def expr(self, node: ASTNode):
+        """Compile an expression, pushing its value."""
+        if isinstance(node, (IntLiteral, FloatLiteral, StringLiteral, BoolLiteral)):
+            self.emit(Op.LOAD_CONST, self.const(node.value))
+
+        elif isinstance(node, NilLiteral):
+            self.emit(Op.LOAD_NIL)
+
+        elif isinstance(node, Identifier):
+            self.emit(Op.LOAD_NAME, self.name(node.name))
+
+        elif isinstance(node, BinaryOp):
+            self.expr(node.left)
+            if node.op == Operator.AND or node.op == Operator.OR:
+                short = Op.JUMP_IF_FALSE_OR_POP if node.op == Operator.AND else Op.JUMP_IF_TRUE_OR_POP
+                jump = self.emit(short)
+                self.expr(node.right)
+                self.patch(jump)
+            else:
+                self.expr(node.right)
+                self.emit(Op.BINARY_OP, node.op)
+
+        elif isinstance(node, UnaryOp):
+            self.expr(node.operand)
+            if node.op == Operator.NOT:
+                self.emit(Op.NOT)
+            else:
+                self.emit(Op.UNARY_OP, node.op)
+
+        elif isinstance(node, FunctionCall):
+            self.expr(node.func)
+            for arg in node.args:
+                self.expr(arg)
+            if node.kw_names:
+                for value in node.kw_values:
+                    self.expr(value)
+                self.emit(Op.LOAD_CONST, self.const(node.kw_names))
+                self.emit(Op.CALL_KW, len(node.args))
+            else:
+                self.emit(Op.CALL, len(node.args))
+
+        elif isinstance(node, ListLiteral):
+            for elem in node.elements:
+                self.expr(elem)
+            self.emit(Op.BUILD_LIST, len(node.elements))
+
+        elif isinstance(node, TupleLiteral):
+            for elem in node.elements:
+                self.expr(elem)
+            self.emit(Op.BUILD_TUPLE, len(node.elements))
+
+        elif isinstance(node, DictLiteral):
+            for pair in node.pairs:
+                self.expr(pair.key)
+                self.expr(pair.value)
+            self.emit(Op.BUILD_DICT, len(node.pairs))
+
+        elif isinstance(node, IndexAccess):
+            self.expr(node.obj)
+            self.expr(node.index)
+            self.emit(Op.INDEX)
+
+        elif isinstance(node, AttributeAccess):
+            self.expr(node.obj)
+            self.emit(Op.LOAD_ATTR, self.name(node.attr))
+
+        else:
+            self.emit(Op.EVAL, self.const(node, shared=False))
+
+class CompiledFunction(SharpFunction):
+    """Sharp function with a compiled body.
+
+    The AST body is kept as well, so the tree-walking interpreter can still
+    call it (e.g. from map/filter or a class body).
+    """
+    def __init__(self, name: str, params: List[str], defaults: List, body, closure, code: CodeObject):
+        super().__init__(name, params, defaults, body, closure)
+        self.code = code
+
+class VM:
+    """Executes CodeObjects against the interpreter's environments."""
+
+    def __init__(self, interpreter: Optional[Interpreter] = None):
+        self.interpreter = interpreter or Interpreter()
+
+    def run(self, program: Program) -> Any:
+        """Compile and run a program in the global environment."""
+        code = Compiler.compile_program(program)
+        return self.execute(code, self.interpreter.global_env)
+
+    def call(self, func: CompiledFunction, args: List[Any], kwargs: dict) -> Any:
+        """Call a compiled function."""
+        func_env = Environment(func.closure)
+
+        # Bind parameters
+        for i, param in enumerate(func.params):
+            if i < len(args):
+                func_env.define(param, args[i])
+            elif param in kwargs:
+                func_env.define(param, kwargs[param])
+            elif i < len(func.defaults) and func.defaults[i] is not None:
+                func_env.define(param, self.interpreter.evaluate(func.defaults[i]))
+            else:
+                raise TypeError(f"missing required argument: '{param}'")
+
+        try:
+            return self.execute(func.code, func_env)
+        except ReturnValue as ret:
+            # Raised by a return inside a node run by the tree walker
+            return ret.value
+
+    def execute(self, co: CodeObject, env: Environment) -> Any:
+        """Run ``co`` with ``env`` as the current scope."""
+        interpreter = self.interpreter
+        prev_env = interpreter.current_env
+        interpreter.current_env = env
+        try:
+            return self._run(co, env)
+        finally:
+            interpreter.current_env = prev_env
+
+    def _run(self, co: CodeObject, env: Environment) -> Any:
+        code = co.code
+        consts = co.consts
+        names = co.names
+        loops = co.loops
+        interpreter = self.interpreter
+        is_truthy = interpreter.is_truthy
+        call_function = interpreter.call_function
+        variables = env.variables
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        blocks: List[tuple] = []  # (loop index, stack depth) per active loop
+        ip = 0
+
+        while True:
+            try:
+                while True:
+                    op = code[ip]
+                    arg = code[ip + 1]
+                    ip += 2
+
+                    if op == LOAD_NAME:
+                        name = names[arg]
+                        push(variables[name] if name in variables else env.get(name))
+                    elif op == LOAD_CONST:
+                        push(consts[arg])
+                    elif op == BINARY_OP:
+                        right = pop()
+                        stack[-1] = BINARY_OPERATIONS[arg](stack[-1], right)
+                    elif op == POP_JUMP_IF_FALSE:
+                        value = pop()
+                        if value is False or (value is not True and not is_truthy(value)):
+                            ip = arg
+                    elif op == CALL or op == CALL_KW:
+                        if interpreter.interrupted:
+                            raise ProgramInterrupted()
+                        if op == CALL_KW:
+                            kwnames = pop()
+                            count = len(kwnames)
+                            kwargs = dict(zip(kwnames, stack[-count:]))
+                            del stack[-count:]
+                        else:
+                            kwargs = {}
+                        if arg:
+                            args = stack[-arg:]
+                            del stack[-arg:]
+                        else:
+                            args = []
+                        func = stack[-1]
+                        if type(func) is CompiledFunction:
+                            stack[-1] = self.call(func, args, kwargs)
+                        else:
+                            stack[-1] = call_function(func, args, kwargs)
+                    elif op == RETURN_VALUE:
+                        return pop()
+                    elif op == JUMP:
+                        # Loops jump back to their head; stop there when asked
+                        if arg < ip and interpreter.interrupted:
+                            raise ProgramInterrupted()
+                        ip = arg
+                    elif op == SET_NAME:
+                        env.set(names[arg], pop())
+                    elif op == STORE_NAME:
+                        variables[names[arg]] = pop()
+                    elif op == POP:
+                        pop()
+                    elif op == FOR_ITER:
+                        try:
+                            push(next(stack[-1]))
+                        except StopIteration:
+                            pop()
+                            ip = arg
+                    elif op == INDEX:
+                        index = pop()
+                        stack[-1] = stack[-1][index]
+                    elif op == LOAD_ATTR:
+                        stack[-1] = interpreter.get_attribute(stack[-1], names[arg])
+                    elif op == LOAD_NIL:
+                        push(SharpNil())
+                    elif op == JUMP_IF_FALSE_OR_POP:
+                        if is_truthy(stack[-1]):
+                            pop()
+                        else:
+                            ip = arg
+                    elif op == JUMP_IF_TRUE_OR_POP:
+                        if is_truthy(stack[-1]):
+                            ip = arg
+                        else:
+                            pop()
+                    elif op == NOT:
+                        stack[-1] = not is_truthy(stack[-1])
+                    elif op == UNARY_OP:
+                        stack[-1] = UNARY_OPERATIONS[arg](stack[-1])
+                    elif op == BUILD_LIST:
+                        items = stack[len(stack) - arg:]
+                        del stack[len(stack) - arg:]
+                        push(items)
+                    elif op == BUILD_TUPLE:
+                        items = tuple(stack[len(stack) - arg:])
+                        del stack[len(stack) - arg:]
+                        push(items)
+                    elif op == BUILD_DICT:
+                        items = stack[len(stack) - 2 * arg:]
+                        del stack[len(stack) - 2 * arg:]
+                        push(dict(zip(items[::2], items[1::2])))
+                    elif op == GET_ITER:
+                        stack[-1] = iter(stack[-1])
+                    elif op == SETUP_LOOP:
+                        blocks.append((arg, len(stack)))
+                    elif op == POP_LOOP:
+                        blocks.pop()
+                    elif op == BREAK_LOOP:
+                        index, depth = blocks[-1]
+                        del stack[depth:]
+                        ip = loops[index][1]
+                    elif op == CONTINUE_LOOP:
+                        index, depth = blocks[-1]
+                        continue_ip, _, continue_depth = loops[index]
+                        del stack[depth + continue_depth:]
+                        if interpreter.interrupted:
+                            raise ProgramInterrupted()
+                        ip = continue_ip
+                    elif op == MAKE_FUNCTION:
+                        node, func_code = consts[arg]
+                        push(CompiledFunction(node.name, node.params, node.defaults, node.body, env, func_code))
+                    elif op == EVAL:
+                        push(interpreter.evaluate(consts[arg]))
+                    else:
+                        raise RuntimeError(f"Unknown opcode: {op}")
+
+            # break/continue from nodes run by the tree walker unwind to the
+            # innermost compiled loop of this frame
+            except BreakException:
+                if not blocks:
+                    raise
+                index, depth = blocks[-1]
+                del stack[depth:]
+                ip = loops[index][1]
+            except ContinueException:
+                if not blocks:
+                    raise
+                index, depth = blocks[-1]
+                continue_ip, _, continue_depth = loops[index]
+                del stack[depth + continue_depth:]
+                ip = continue_ip
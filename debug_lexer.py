@@ -1,5 +1,6 @@
 """Debug lexer output"""
-from lexer import Lexer
+import sys
+from lexer import tokenize_cached
 
 source = """def factorial(n):
     if n <= 1:
@@ -7,8 +8,5 @@ source = """def factorial(n):
     return n * factorial(n - 1)
 """
 
-lexer = Lexer(source)
-tokens = lexer.tokenize()
-
-for token in tokens:
-    print(token)
+# Stream tokens straight to the buffered stdout
+sys.stdout.writelines(f"{token!r}\n" for token in tokenize_cached(source))
@@ -16,24 +16,33 @@ import sys
 import os
 import re
 import json
+import mmap
+import shutil
+import tempfile
+import threading
 import warnings
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from io import StringIO
 
 try:
     from PyQt5.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QSplitter, QTextEdit, QListWidget, QListWidgetItem, QLabel,
+        QSplitter, QTextEdit, QListWidgetItem, QListView, QLabel,
         QFileDialog, QMessageBox, QStatusBar, QMenu, QMenuBar,
         QAction, QDockWidget, QFrame, QComboBox, QLineEdit, QPushButton,
         QTabWidget, QDialog, QInputDialog, QPlainTextEdit, QTreeWidget,
         QTreeWidgetItem, QHeaderView, QScrollArea, QTextBrowser
     )
-    from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize, QRect, QFileSystemWatcher
+    from PyQt5.QtCore import (
+        Qt, QTimer, QThread, pyqtSignal, QSize, QRect, QFileSystemWatcher, QStringListModel,
+        QObject, QRunnable, QThreadPool
+    )
     from PyQt5.QtGui import (
         QFont, QColor, QSyntaxHighlighter, QTextDocument, QTextFormat,
         QTextCharFormat, QFontDatabase, QIcon, QKeySequence, QPainter,
-        QTextCursor
+        QPixmap, QTextCursor
     )
     from PyQt5.Qsci import QsciScintilla, QsciLexerPython
 except ImportError:
@@ -44,11 +53,55 @@ except ImportError:
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from lexer import Lexer
-from parser import Parser
-from interpreter import Interpreter
+# The lexer, parser and interpreter are imported on the first run so the
+# window comes up without them; stdlib is needed for builtin names
 from stdlib import SharpNil, STDLIB
 
+# Sharp keywords, shared by the highlighter and the completer
+HIGHLIGHT_KEYWORDS = (
+    'def', 'let', 'if', 'elif', 'else', 'while', 'for', 'in', 'return',
+    'break', 'continue', 'match', 'case', 'type', 'import', 'from', 'as',
+    'lambda', 'true', 'false', 'nil'
+)
+# Every word the completer offers as a keyword, for membership tests
+SHARP_KEYWORDS = frozenset(HIGHLIGHT_KEYWORDS + (
+    'and', 'or', 'not',
+    'class', 'try', 'except', 'finally', 'with', 'raise', 'async', 'await', 'yield',
+    'self', 'super', 'pass'
+))
+
+# Completion patterns, compiled once at import
+# Top-level public functions, the names a module can export
+_DEF_RE = re.compile(r'^def\s+([A-Za-z]\w*)', re.MULTILINE)
+_FROM_IMPORT_LINE_RE = re.compile(r'\s*from\s+(\w+)\s+import\s+(?:\w+\s*,\s*)*\w*$')
+
+
+@lru_cache(maxsize=256)
+def _filter_completions(pool, prefix):
+    """Names in the sorted pool tuple that start with prefix."""
+    start = end = bisect_left(pool, prefix)
+    while end < len(pool) and pool[end].startswith(prefix):
+        end += 1
+    return pool[start:end]
+
+
+@lru_cache(maxsize=1)
+def _scan_modules(directory):
+    """Sorted names of the .sharp and .py modules in directory, shared by all editors."""
+    try:
+        with os.scandir(directory) as entries:
+            return tuple(sorted({sys.intern(entry.name.partition('.')[0]) for entry in entries
+                                 if entry.name.endswith(('.sharp', '.py'))}))
+    except OSError:
+        return ()
+
+
+@lru_cache(maxsize=64)
+def _module_exports(path, mtime):
+    """Names defined with def in a module file; mtime keys out stale entries."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return tuple(sorted(set(map(sys.intern, _DEF_RE.findall(f.read())))))
+
 
 class IntelligentAutoCompleter:
     """Context-aware autocompletion engine that understands Sharp language syntax."""
@@ -100,24 +153,49 @@ class IntelligentAutoCompleter:
         'not': ['identifier', '('],
     }
     
-    KEYWORDS = [
-        'def', 'let', 'if', 'elif', 'else', 'while', 'for', 'in', 'return',
-        'break', 'continue', 'match', 'case', 'type', 'import', 'from', 'as',
-        'lambda', 'true', 'false', 'nil', 'and', 'or', 'not',
-        'class', 'try', 'except', 'finally', 'with', 'raise', 'async', 'await', 'yield',
-        'self', 'super', 'pass'
-    ]
+    KEYWORDS = SHARP_KEYWORDS
+    
+    # Shared by the completers of every editor tab, set up by the first one
+    _modules_watcher = None
+    _static_pool = ()
     
     def __init__(self):
         self.last_tokens = []
+        self.last_line = ''
+        self._modules_dir = os.path.join(os.path.dirname(__file__), 'modules')
+        cls = type(self)
+        if cls._modules_watcher is None:
+            # Drop the module listing when files come or go
+            cls._modules_watcher = QFileSystemWatcher([self._modules_dir])
+            cls._modules_watcher.directoryChanged.connect(cls._invalidate_modules)
+            # Keywords and builtins never change, so they share one sorted
+            # pool that prefix lookups bisect
+            cls._static_pool = tuple(sorted(cls.KEYWORDS.union(STDLIB)))
+    
+    def _get_modules(self):
+        """Module names, re-listed only after the directory has changed."""
+        return _scan_modules(self._modules_dir)
+    
+    @staticmethod
+    def _invalidate_modules(path=None):
+        """Forget the module listing so the next lookup re-reads it."""
+        _scan_modules.cache_clear()
+    
+    def _get_module_exports(self, name):
+        """Functions a module defines, or () if it has no source file here."""
+        for ext in ('.sharp', '.py'):
+            path = os.path.join(self._modules_dir, name + ext)
+            try:
+                return _module_exports(path, os.path.getmtime(path))
+            except (OSError, UnicodeDecodeError):
+                continue
+        return ()
     
     def update_context(self, code, cursor_pos):
         """Update the context based on current code."""
         # Get last line
-        lines = code[:cursor_pos].split('\n')
-        if lines:
-            last_line = lines[-1].strip()
-            self.last_tokens = last_line.split()
+        self.last_line = code[code.rfind('\n', 0, cursor_pos) + 1:cursor_pos]
+        self.last_tokens = self.last_line.split()
     
     def get_suggestions(self, word_prefix, code, cursor_pos):
         """Get intelligent suggestions based on context."""
@@ -138,22 +216,17 @@ class IntelligentAutoCompleter:
             context_tokens = self.OPERATOR_CONTEXT[last_token]
             suggestions.extend([t for t in context_tokens if t.startswith(word_prefix)])
         
-        # Always add matching keywords
-        suggestions.extend([k for k in self.KEYWORDS if k.startswith(word_prefix)])
+        # After "from <module> import", offer what the module defines
+        from_import = _FROM_IMPORT_LINE_RE.match(self.last_line)
+        if from_import:
+            exports = self._get_module_exports(from_import.group(1))
+            suggestions.extend(_filter_completions(exports, word_prefix))
         
-        # Add modules
-        module_dir = os.path.join(os.path.dirname(__file__), 'modules')
-        if os.path.exists(module_dir):
-            try:
-                module_files = os.listdir(module_dir)
-                modules = sorted(set([f.split('.')[0] for f in module_files 
-                                     if f.endswith('.sharp') or f.endswith('.py')]))
-                suggestions.extend([m for m in modules if m.startswith(word_prefix)])
-            except:
-                pass
+        # Always add matching keywords and builtins
+        suggestions.extend(_filter_completions(self._static_pool, word_prefix))
         
-        # Add builtins
-        suggestions.extend([b for b in STDLIB.keys() if b.startswith(word_prefix)])
+        # Add modules
+        suggestions.extend(_filter_completions(self._get_modules(), word_prefix))
         
         # Remove duplicates and sort
         suggestions = sorted(set(suggestions))
@@ -162,113 +235,170 @@ class IntelligentAutoCompleter:
 
 
 class LineNumberArea(QFrame):
-    """Line number display on the left side of the editor."""
+    """Line number display on the left side of the editor.
+    
+    The numbers are rendered into a pixmap that is reused until the view
+    or the document changes.
+    """
     
     def __init__(self, editor):
         super().__init__()
         self.editor = editor
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #252526;
-                border-right: 1px solid #3e3e42;
-            }
-        """)
         self.setFixedWidth(50)
-    
-    def paintEvent(self, event):
-        """Paint line numbers."""
-        if not self.editor:
-            super().paintEvent(event)
-            return
-        
+        self._font = QFont("Courier New", 10)
+        self._font.setFixedPitch(True)
+        self._background = QColor(37, 37, 38)
+        self._pen_color = QColor(134, 134, 134)
+        self._cache_key = None
+        self._cache_pixmap = None
+    
+    def _view_key(self):
+        """Everything the painted numbers depend on."""
+        editor = self.editor
+        return (editor.firstVisibleBlock().blockNumber(), editor.verticalScrollBar().value(),
+                editor.blockCount(), editor.document().revision(),
+                editor.viewport().width(), self.height(), self.devicePixelRatioF())
+    
+    def _render(self):
+        """Paint the visible line numbers into a new pixmap."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self._background)
+        
+        painter = QPainter(pixmap)
         try:
-            painter = QPainter(self)
-            painter.fillRect(event.rect(), QColor(37, 37, 38))
-            
             block = self.editor.firstVisibleBlock()
             block_number = block.blockNumber()
             top = self.editor.blockBoundingGeometry(block).translated(self.editor.contentOffset()).top()
             
-            font = QFont("Courier New", 10)
-            painter.setFont(font)
-            painter.setPen(QColor(134, 134, 134))
+            painter.setFont(self._font)
+            painter.setPen(self._pen_color)
+            line_height = int(self.editor.fontMetrics().height())
             
-            # Limit iterations to prevent infinite loops
-            max_iterations = 1000
-            iterations = 0
+            bottom_edge = self.height()
             
-            while block.isValid() and top <= event.rect().bottom() and iterations < max_iterations:
+            while block.isValid() and top <= bottom_edge:
                 bottom = top + self.editor.blockBoundingRect(block).height()
                 
-                if bottom >= event.rect().top():
-                    number = str(block_number + 1)
-                    painter.drawText(5, int(top), 40, int(self.editor.fontMetrics().height()),
-                                   Qt.AlignRight, number)
+                if bottom >= 0:
+                    painter.drawText(5, int(top), 40, line_height,
+                                     Qt.AlignRight, str(block_number + 1))
                 
                 block = block.next()
                 top = bottom
                 block_number += 1
-                iterations += 1
+        finally:
+            painter.end()
+        return pixmap
+    
+    def paintEvent(self, event):
+        """Paint line numbers."""
+        if not self.editor:
+            super().paintEvent(event)
+            return
+        
+        try:
+            key = self._view_key()
+            if key != self._cache_key:
+                self._cache_pixmap = self._render()
+                self._cache_key = key
             
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._cache_pixmap)
             painter.end()
         except Exception:
             pass  # Silently handle any paint errors
 
 
+# Highlighting patterns, compiled once at import
+_KW_RE = re.compile(r'\b(' + '|'.join(HIGHLIGHT_KEYWORDS) + r')\b')
+_BUILTIN_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, sorted(STDLIB, key=len, reverse=True))) + r')\b')
+_STRING_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')')
+_COMMENT_RE = re.compile(r'#.*$', re.MULTILINE)
+_NUM_RE = re.compile(r'\b\d+\.?\d*\b')
+# All of the above in one pass; earlier alternatives win where matches overlap
+_HIGHLIGHT_RE = re.compile('|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in (
+    ('comment', _COMMENT_RE), ('string', _STRING_RE), ('keyword', _KW_RE),
+    ('builtin', _BUILTIN_RE), ('number', _NUM_RE))))
+
+
+@lru_cache(maxsize=1)
+def _highlight_formats():
+    """Format for each named group of _HIGHLIGHT_RE, shared by every highlighter."""
+    def char_format(red, green, blue, weight=None):
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(red, green, blue))
+        if weight is not None:
+            fmt.setFontWeight(weight)
+        return fmt
+    
+    return {
+        'comment': char_format(106, 153, 85),  # Green
+        'string': char_format(206, 145, 120),  # Orange
+        'keyword': char_format(86, 156, 214, 700),  # Blue
+        'builtin': char_format(78, 201, 176),  # Cyan
+        'number': char_format(181, 206, 168),  # Light green
+    }
+
+
 class SyntaxHighlighter(QSyntaxHighlighter):
-    """Custom syntax highlighter for Sharp code."""
+    """Custom syntax highlighter for Sharp code.
     
-    def __init__(self, document):
+    With an editor attached, only blocks near its viewport are highlighted;
+    the rest are marked PENDING and picked up by the editor as they scroll
+    into view.
+    """
+    
+    # Block state of blocks skipped while off screen
+    PENDING = 1
+    
+    def __init__(self, document, editor=None):
         super().__init__(document)
+        self.editor = editor
         
-        self.keyword_format = QTextCharFormat()
-        self.keyword_format.setForeground(QColor(86, 156, 214))  # Blue
-        self.keyword_format.setFontWeight(700)
-        
-        self.string_format = QTextCharFormat()
-        self.string_format.setForeground(QColor(206, 145, 120))  # Orange
-        
-        self.comment_format = QTextCharFormat()
-        self.comment_format.setForeground(QColor(106, 153, 85))  # Green
-        
-        self.number_format = QTextCharFormat()
-        self.number_format.setForeground(QColor(181, 206, 168))  # Light green
-        
-        self.builtin_format = QTextCharFormat()
-        self.builtin_format.setForeground(QColor(78, 201, 176))  # Cyan
-        
-        self.keywords = [
-            'def', 'let', 'if', 'elif', 'else', 'while', 'for', 'in', 'return',
-            'break', 'continue', 'match', 'case', 'type', 'import', 'from', 'as',
-            'lambda', 'true', 'false', 'nil'
-        ]
+        self.keywords = HIGHLIGHT_KEYWORDS
+        self.formats = _highlight_formats()
     
     def highlightBlock(self, text):
         """Highlight a block of code."""
-        # Keywords
-        for word in self.keywords:
-            pattern = r'\b' + word + r'\b'
-            for match in re.finditer(pattern, text):
-                self.setFormat(match.start(), match.end() - match.start(), self.keyword_format)
-        
-        # Strings
-        string_pattern = r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')'
-        for match in re.finditer(string_pattern, text):
-            self.setFormat(match.start(), match.end() - match.start(), self.string_format)
-        
-        # Comments
-        comment_pattern = r'#.*$'
-        for match in re.finditer(comment_pattern, text):
-            self.setFormat(match.start(), match.end() - match.start(), self.comment_format)
+        if self.editor is not None:
+            first, last = self.editor.visible_block_range()
+            if not first <= self.currentBlock().blockNumber() <= last:
+                self.setCurrentBlockState(self.PENDING)
+                return
+            self.setCurrentBlockState(-1)
         
-        # Numbers
-        number_pattern = r'\b\d+\.?\d*\b'
-        for match in re.finditer(number_pattern, text):
-            self.setFormat(match.start(), match.end() - match.start(), self.number_format)
+        # One scan per block, each span formatted once
+        formats = self.formats
+        for match in _HIGHLIGHT_RE.finditer(text):
+            start = match.start()
+            self.setFormat(start, match.end() - start, formats[match.lastgroup])
+
+
+_OPENING_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
 
+def _index_brackets(text):
+    """Map the offset of each matched bracket in text to its partner's."""
+    pairs = {}
+    stack = []
+    for i, char in enumerate(text):
+        if char in _OPENING_BRACKETS:
+            stack.append((_OPENING_BRACKETS[char], i))
+        elif char in ')]}':
+            if stack and stack[-1][0] == char:
+                _, start = stack.pop()
+                pairs[start] = i
+                pairs[i] = start
+            else:
+                stack.clear()  # a stray closer ends every pair still open
+    return pairs
 
-class AutocompleteWidget(QListWidget):
-    """Autocomplete popup widget."""
+
+class AutocompleteWidget(QListView):
+    """Autocomplete popup widget, showing a string list model."""
     
     item_selected = pyqtSignal(str)
     
@@ -277,26 +407,58 @@ class AutocompleteWidget(QListWidget):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.NoDropShadowWindowHint)
         self.setAttribute(Qt.WA_TranslucentBackground, False)
         self.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #2b2b2b;
                 color: #d4d4d4;
                 border: 1px solid #555;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #0d7377;
             }
         """)
-        self.itemClicked.connect(self._on_item_selected)
-    
-    def _on_item_selected(self, item):
+        self.setEditTriggers(QListView.NoEditTriggers)
+        self._model = QStringListModel(self)
+        self.setModel(self._model)
+        self.clicked.connect(self._on_item_selected)
+        self._entries = []
+        self._editor = None
+    
+    def attach(self, editor):
+        """Move the popup onto editor and send selections there."""
+        if editor is self._editor:
+            return
+        if self._editor is not None:
+            self.item_selected.disconnect(self._editor._apply_autocomplete)
+        self.hide()
+        self.setParent(editor, self.windowFlags())
+        self._editor = editor
+        self.item_selected.connect(editor._apply_autocomplete)
+    
+    def detach(self, editor, parent):
+        """Hand the popup to parent if editor is about to go away."""
+        if editor is not self._editor:
+            return
+        self.item_selected.disconnect(editor._apply_autocomplete)
+        self.hide()
+        self.setParent(parent, self.windowFlags())
+        self._editor = None
+    
+    def set_entries(self, entries):
+        """Show entries, rebuilding the rows only when they have changed."""
+        if entries != self._entries:
+            self._model.setStringList(entries)
+            self._entries = entries
+        self.setCurrentIndex(self._model.index(0))
+    
+    def _on_item_selected(self, index):
         """Handle item selection."""
-        self.item_selected.emit(item.text())
+        self.item_selected.emit(index.data())
     
     def keyPressEvent(self, event):
         """Handle key press events."""
         if event.key() == Qt.Key_Return:
-            if self.currentItem():
-                self.item_selected.emit(self.currentItem().text())
+            if self.currentIndex().isValid():
+                self.item_selected.emit(self.currentIndex().data())
         elif event.key() == Qt.Key_Escape:
             self.hide()
         elif event.key() in (Qt.Key_Up, Qt.Key_Down):
@@ -309,7 +471,14 @@ class AutocompleteWidget(QListWidget):
 class SharpEditorWidget(QPlainTextEdit):
     """Advanced text editor for Sharp code with PyCharm-like features."""
     
-    def __init__(self, parent=None):
+    # Idle time before autocomplete and line numbers catch up with typing
+    EDIT_DEBOUNCE_MS = 150
+    # Shorter wait after a word or line is finished
+    EDIT_DEBOUNCE_FAST_MS = 30
+    # Shortest word that brings up completions
+    AUTOCOMPLETE_MIN_CHARS = 1
+    
+    def __init__(self, parent=None, autocomplete=None):
         super().__init__(parent)
         
         # Font setup
@@ -317,43 +486,54 @@ class SharpEditorWidget(QPlainTextEdit):
         font.setFixedPitch(True)
         self.setFont(font)
         
-        # Style
-        self.setStyleSheet("""
-            QPlainTextEdit {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                border: none;
-            }
-        """)
-        
         # Syntax highlighter
-        self.highlighter = SyntaxHighlighter(self.document())
+        self.highlighter = SyntaxHighlighter(self.document(), self)
         
         # Intelligent autocompletion engine
         self.auto_completer = IntelligentAutoCompleter()
         
-        # Line numbers
+        # Line numbers, with the (line count, first visible line) last painted
         self.line_number_area = LineNumberArea(self)
+        self._line_numbers_key = None
         
-        # Autocomplete
-        self.autocomplete = AutocompleteWidget(self)
-        self.autocomplete.hide()
-        self.autocomplete.item_selected.connect(self._apply_autocomplete)
+        # Autocomplete, usually one popup shared by every editor
+        if autocomplete is None:
+            autocomplete = AutocompleteWidget()
+            autocomplete.attach(self)
+        self.autocomplete = autocomplete
         
         # Bracket matching
         self.bracket_pairs = {'(': ')', '[': ']', '{': '}', '"': '"', "'": "'"}
         self.matching_bracket_format = QTextCharFormat()
         self.matching_bracket_format.setBackground(QColor(100, 100, 100))
+        # Bracket pairs of the last block looked at, keyed by (number, revision)
+        self._bracket_key = None
+        self._bracket_index = {}
+        self._bracket_highlighted = False
         
         # Search state
         self.search_term = None
         self.search_results = []
         self.current_search_index = 0
         
+        # Per-edit work is coalesced until typing goes idle
+        self._edit_timer = QTimer(self)
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.timeout.connect(self._run_deferred_update)
+        self._edit_delay = self.EDIT_DEBOUNCE_MS
+        # Document revision the deferred update last caught up with
+        self._last_revision = None
+        # Word before the cursor, keyed by (block number, revision, column)
+        self._word_key = None
+        self._word = ""
+        # Set by a paste, which wants line numbers but no completion popup
+        self._skip_autocomplete = False
+        
         # Setup
         self.textChanged.connect(self._on_text_changed)
         self.cursorPositionChanged.connect(self._update_line_numbers)
         self.cursorPositionChanged.connect(self._highlight_matching_brackets)
+        self.updateRequest.connect(self._on_update_request)
         
         # Keybindings
         self.setup_keybindings()
@@ -363,55 +543,96 @@ class SharpEditorWidget(QPlainTextEdit):
         pass  # Already handled in main window
     
     def _on_text_changed(self):
-        """Handle text change for autocomplete and highlighting."""
-        self._show_autocomplete()
+        """Schedule autocomplete and line numbers, restarting any pending run."""
+        self._edit_timer.start(self._edit_delay)
+        self._edit_delay = self.EDIT_DEBOUNCE_MS
+    
+    def _run_deferred_update(self):
+        """Catch up with the edits made since the last run."""
+        # textChanged also fires for changes that leave the text alone
+        revision = self.document().revision()
+        if revision == self._last_revision:
+            return
+        self._last_revision = revision
         self._update_line_numbers()
+        if self._skip_autocomplete:
+            self._skip_autocomplete = False
+            self.autocomplete.hide()
+        else:
+            self._show_autocomplete()
     
     def _update_line_numbers(self):
-        """Update line number area."""
+        """Repaint the line number area when the numbers it shows have changed."""
+        key = (self.blockCount(), self.firstVisibleBlock().blockNumber())
+        if key == self._line_numbers_key:
+            return
+        self._line_numbers_key = key
         self.line_number_area.update()
     
+    def visible_block_range(self):
+        """First and last block numbers to highlight: the viewport plus a screen either side."""
+        first = self.firstVisibleBlock().blockNumber()
+        lines = self.viewport().height() // max(1, self.fontMetrics().lineSpacing()) + 1
+        return max(0, first - lines), first + 2 * lines
+    
+    def _highlight_visible_blocks(self):
+        """Highlight blocks that were skipped while off screen."""
+        first, last = self.visible_block_range()
+        block = self.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if block.userState() == SyntaxHighlighter.PENDING:
+                self.highlighter.rehighlightBlock(block)
+            block = block.next()
+    
+    def _on_update_request(self, rect, dy):
+        """Catch up on highlighting and line numbers after a scroll."""
+        if dy:
+            self._highlight_visible_blocks()
+            self._update_line_numbers()
+    
     def _get_current_word(self):
         """Get the current word being typed."""
         cursor = self.textCursor()
         block = cursor.block()
-        pos_in_block = cursor.positionInBlock()
-        text = block.text()
-        
-        word = ""
-        i = pos_in_block - 1
-        while i >= 0 and (text[i].isalnum() or text[i] == '_'):
-            word = text[i] + word
-            i -= 1
+        key = (block.blockNumber(), block.revision(), cursor.positionInBlock())
+        if key == self._word_key:
+            return self._word
         
+        # Scan back from the cursor over identifier characters
+        text = block.text()
+        end = cursor.positionInBlock()
+        start = end
+        while start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+            start -= 1
+        word = text[start:end]
+        
+        self._word_key = key
+        self._word = word
         return word
     
     def _show_autocomplete(self):
         """Show autocomplete suggestions using intelligent context."""
         word = self._get_current_word()
         
-        if not word or len(word) < 1:
+        if len(word) < self.AUTOCOMPLETE_MIN_CHARS:
             self.autocomplete.hide()
             return
         
-        # Get cursor position for context
-        code = self.toPlainText()
+        # Context comes from the current line only, so skip copying the whole buffer
         cursor = self.textCursor()
-        cursor_pos = cursor.position()
+        line = cursor.block().text()
+        cursor_pos = cursor.positionInBlock()
         
         # Use intelligent autocompletion engine
-        completions = self.auto_completer.get_suggestions(word, code, cursor_pos)
+        completions = self.auto_completer.get_suggestions(word, line, cursor_pos)
         
         if not completions:
             self.autocomplete.hide()
             return
         
         # Update autocomplete widget
-        self.autocomplete.clear()
-        for comp in completions[:15]:  # Limit to 15 items
-            self.autocomplete.addItem(comp)
-        
-        self.autocomplete.setCurrentRow(0)
+        self.autocomplete.attach(self)
+        self.autocomplete.set_entries(completions[:15])  # Limit to 15 items
         
         # Position autocomplete
         cursor = self.textCursor()
@@ -426,40 +647,45 @@ class SharpEditorWidget(QPlainTextEdit):
         word = self._get_current_word()
         cursor = self.textCursor()
         
-        # Delete the word
-        cursor.movePosition(cursor.WordLeft)
-        cursor.movePosition(cursor.EndOfWord, cursor.KeepAnchor)
-        cursor.removeSelectedText()
-        
-        # Insert the completion
+        # Select the word from its start, known from the typed prefix, and
+        # replace it with the completion in a single edit
+        cursor.setPosition(cursor.position() - len(word))
+        cursor.movePosition(QTextCursor.EndOfWord, QTextCursor.KeepAnchor)
         cursor.insertText(text)
         self.setTextCursor(cursor)
         
         self.autocomplete.hide()
     
+    def _block_bracket_pairs(self, block):
+        """Bracket pairs of a block, re-indexed only after the block changes."""
+        key = (block.blockNumber(), block.revision())
+        if key != self._bracket_key:
+            self._bracket_key = key
+            self._bracket_index = _index_brackets(block.text())
+        return self._bracket_index
+    
     def _highlight_matching_brackets(self):
-        """Highlight matching brackets."""
+        """Highlight the bracket before the cursor and its partner."""
         cursor = self.textCursor()
-        block = cursor.block()
         pos_in_block = cursor.positionInBlock()
-        text = block.text()
         
-        if pos_in_block > 0 and pos_in_block <= len(text):
-            char = text[pos_in_block - 1] if pos_in_block > 0 else ''
-            
-            # Check if it's a closing bracket
-            if char in self.bracket_pairs.values():
-                # Find matching opening bracket
-                opening = [k for k, v in self.bracket_pairs.items() if v == char][0]
-                count = 1
-                i = pos_in_block - 2
-                
-                while i >= 0 and count > 0:
-                    if text[i] == char:
-                        count += 1
-                    elif text[i] == opening:
-                        count -= 1
-                    i -= 1
+        selections = []
+        if pos_in_block > 0:
+            block = cursor.block()
+            partner = self._block_bracket_pairs(block).get(pos_in_block - 1)
+            if partner is not None:
+                for offset in (pos_in_block - 1, partner):
+                    selection = QTextEdit.ExtraSelection()
+                    selection.format = self.matching_bracket_format
+                    selection.cursor = QTextCursor(block)
+                    selection.cursor.setPosition(block.position() + offset)
+                    selection.cursor.movePosition(QTextCursor.NextCharacter, QTextCursor.KeepAnchor)
+                    selections.append(selection)
+        
+        # Only touch the view when something is or was highlighted
+        if selections or self._bracket_highlighted:
+            self.setExtraSelections(selections)
+            self._bracket_highlighted = bool(selections)
     
     def keyPressEvent(self, event):
         """Handle key press events."""
@@ -478,11 +704,20 @@ class SharpEditorWidget(QPlainTextEdit):
             self.parent().parent().parent().show_find_replace(replace=True)
             return
         
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
+            self._edit_delay = self.EDIT_DEBOUNCE_FAST_MS
         super().keyPressEvent(event)
     
+    def insertFromMimeData(self, source):
+        """Paste, catching up straight away without offering completions."""
+        self._skip_autocomplete = True
+        self._edit_delay = self.EDIT_DEBOUNCE_FAST_MS
+        super().insertFromMimeData(source)
+    
     def resizeEvent(self, event):
         """Resize line number area."""
         super().resizeEvent(event)
+        self._highlight_visible_blocks()
         cr = self.contentsRect()
         self.line_number_area.setGeometry(cr.left(), cr.top(), 50, cr.height())
 
@@ -533,8 +768,13 @@ class FindReplaceDialog(QDialog):
         if not search_term:
             return
         
-        text = self.editor.toPlainText()
-        count = text.count(search_term)
+        # Walk the matches in the document instead of copying its text out
+        document = self.editor.document()
+        count = 0
+        found = document.find(search_term, 0, QTextDocument.FindCaseSensitively)
+        while not found.isNull():
+            count += 1
+            found = document.find(search_term, found, QTextDocument.FindCaseSensitively)
         QMessageBox.information(self, "Find", f"Found {count} occurrences")
     
     def replace_all(self):
@@ -548,11 +788,20 @@ class FindReplaceDialog(QDialog):
         if not search_term:
             return
         
-        text = self.editor.toPlainText()
-        new_text = text.replace(search_term, replace_term)
-        self.editor.setPlainText(new_text)
-        
-        QMessageBox.information(self, "Replace", "Replaced all occurrences")
+        # Edit matches in place as one undo step, so only the touched
+        # blocks are rehighlighted
+        document = self.editor.document()
+        edit = QTextCursor(document)
+        edit.beginEditBlock()
+        count = 0
+        found = document.find(search_term, 0, QTextDocument.FindCaseSensitively)
+        while not found.isNull():
+            found.insertText(replace_term)
+            count += 1
+            found = document.find(search_term, found, QTextDocument.FindCaseSensitively)
+        edit.endEditBlock()
+        
+        QMessageBox.information(self, "Replace", f"Replaced {count} occurrences")
 
 
 class GoToLineDialog(QDialog):
@@ -632,7 +881,13 @@ class FileExplorer(QTreeWidget):
         """)
         
         self.itemDoubleClicked.connect(self._on_item_clicked)
+        self.itemExpanded.connect(self._on_item_expanded)
         self.current_root = None
+        
+        # Directories whose children have been listed, by path
+        self._dir_items = {}
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
     
     def _on_item_clicked(self, item, column):
         """Handle file selection."""
@@ -640,32 +895,125 @@ class FileExplorer(QTreeWidget):
         if file_path and os.path.isfile(file_path):
             self.file_selected.emit(file_path)
     
+    def _on_item_expanded(self, item):
+        """List a directory the first time it is opened."""
+        path = item.data(0, Qt.UserRole)
+        if path not in self._dir_items:
+            self._add_files(item, path)
+    
+    def _on_directory_changed(self, path):
+        """Re-list a watched directory after files in it came or went."""
+        item = self._dir_items.get(path)
+        if item is None or not os.path.isdir(path):
+            return  # a removed directory goes when its parent is re-listed
+        entries = self._list_dir(path)
+        # Keep surviving items, and with them their expanded subtrees
+        kept = set()
+        for i in reversed(range(item.childCount())):
+            child = item.child(i)
+            child_path = child.data(0, Qt.UserRole)
+            was_dir = child.childIndicatorPolicy() == QTreeWidgetItem.ShowIndicator
+            if entries.get(child_path) is not was_dir:
+                self._forget(item.takeChild(i))
+            else:
+                kept.add(child_path)
+        for entry_path, is_dir in entries.items():
+            if entry_path not in kept:
+                self._add_entry(item, entry_path, is_dir)
+    
+    def _forget(self, item):
+        """Stop tracking a removed directory item and everything under it."""
+        path = item.data(0, Qt.UserRole)
+        if self._dir_items.pop(path, None) is not None:
+            self._watcher.removePath(path)
+        for i in range(item.childCount()):
+            self._forget(item.child(i))
+    
     def load_project(self, root_path):
         """Load project directory."""
         self.current_root = root_path
         self.clear()
+        if self._watcher.directories():
+            self._watcher.removePaths(self._watcher.directories())
+        self._dir_items = {}
         
         root_item = QTreeWidgetItem(self, [os.path.basename(root_path)])
         root_item.setData(0, Qt.UserRole, root_path)
         
         self._add_files(root_item, root_path)
-        self.expandAll()
+        root_item.setExpanded(True)
     
     def _add_files(self, parent_item, directory):
-        """Recursively add files to tree."""
+        """Add one level of files to the tree; subdirectories load when expanded."""
+        self._dir_items[directory] = parent_item
+        self._watcher.addPath(directory)
+        for entry_path, is_dir in self._list_dir(directory).items():
+            self._add_entry(parent_item, entry_path, is_dir)
+    
+    def _add_entry(self, parent_item, path, is_dir):
+        """Add one file or directory item under parent_item."""
+        tree_item = QTreeWidgetItem(parent_item, [os.path.basename(path)])
+        tree_item.setData(0, Qt.UserRole, path)
+        if is_dir:
+            tree_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+    
+    @staticmethod
+    def _list_dir(directory):
+        """Whether each visible entry of directory is a directory, by path."""
         try:
-            for item in os.listdir(directory):
-                if item.startswith('.'):
-                    continue
-                
-                item_path = os.path.join(directory, item)
-                tree_item = QTreeWidgetItem(parent_item, [item])
-                tree_item.setData(0, Qt.UserRole, item_path)
-                
-                if os.path.isdir(item_path):
-                    self._add_files(tree_item, item_path)
+            with os.scandir(directory) as entries:
+                return {entry.path: entry.is_dir() for entry in entries
+                        if not entry.name.startswith('.')}
         except PermissionError:
-            pass
+            return {}
+
+
+# Outline entries, functions and variables found in one pass
+_OUTLINE_RE = re.compile(r'def\s+(?P<func>\w+)\s*\(|let\s+(?P<var>\w+)\s*=')
+# Outline label for each entry kind
+_OUTLINE_LABELS = {'func': "🔷 {}()", 'var': "◆ {}"}
+
+
+class OutlineWorker(QThread):
+    """Finds code outline entries away from the GUI thread.
+    
+    Only the latest request is kept, so a burst of edits costs one parse.
+    """
+    
+    parsed = pyqtSignal(int, list)  # request number, (kind, name, offset) entries
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._condition = threading.Condition()
+        self._pending = None  # (request number, code) not yet parsed
+        self._stopping = False
+    
+    def request(self, number, code):
+        """Parse code next, replacing any request still waiting."""
+        with self._condition:
+            self._pending = (number, code)
+            self._condition.notify()
+    
+    def stop(self):
+        """Finish the current parse, if any, and end the thread."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self.wait()
+    
+    def run(self):
+        """Parse requests until stopped."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                number, code = self._pending
+                self._pending = None
+            entries = [(match.lastgroup, match.group(match.lastgroup), match.start())
+                       for match in _OUTLINE_RE.finditer(code)]
+            self.parsed.emit(number, entries)
 
 
 class CodeOutline(QTreeWidget):
@@ -684,27 +1032,65 @@ class CodeOutline(QTreeWidget):
                 background-color: #0d7377;
             }
         """)
+        
+        # Parsing happens on a worker; only the latest request is shown
+        self._worker = None
+        self._request = 0
     
     def parse_code(self, code):
-        """Parse Sharp code and extract structure."""
-        self.clear()
-        
-        # Find functions
-        func_pattern = r'def\s+(\w+)\s*\('
-        for match in re.finditer(func_pattern, code):
-            item = QTreeWidgetItem(self, [f"🔷 {match.group(1)}()"])
-            item.setData(0, Qt.UserRole, match.start())
-        
-        # Find variables
-        var_pattern = r'let\s+(\w+)\s*='
-        for match in re.finditer(var_pattern, code):
-            item = QTreeWidgetItem(self, [f"◆ {match.group(1)}"])
-            item.setData(0, Qt.UserRole, match.start())
+        """Parse Sharp code and extract structure in the background."""
+        if self._worker is None:
+            self._worker = OutlineWorker(self)
+            self._worker.parsed.connect(self._apply_entries)
+            self._worker.start()
+        self._request += 1
+        self._worker.request(self._request, code)
+    
+    def shutdown(self):
+        """Stop the parsing thread; call before the application quits."""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+    
+    def _apply_entries(self, number, entries):
+        """Show a finished parse.
+        
+        Entries shared with the previous parse at either end are kept and
+        only the ones in between are replaced.
+        """
+        if number != self._request:
+            return  # superseded by a newer edit
+        
+        old = [self.topLevelItem(i).text(0) for i in range(self.topLevelItemCount())]
+        new = [_OUTLINE_LABELS[kind].format(name) for kind, name, _ in entries]
+        
+        # Length of the unchanged head and tail
+        limit = min(len(old), len(new))
+        head = 0
+        while head < limit and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+        
+        for _ in range(len(old) - head - tail):
+            self.takeTopLevelItem(head)
+        self.insertTopLevelItems(head, [QTreeWidgetItem([label])
+                                        for label in new[head:len(new) - tail]])
+        
+        # Offsets move with any edit above an entry
+        for i, (_, _, offset) in enumerate(entries):
+            self.topLevelItem(i).setData(0, Qt.UserRole, offset)
 
 
 class OutputPanel(QWidget):
     """Output panel with tabs for console, errors, etc."""
     
+    # Longest program output waits before reaching the console
+    FLUSH_MS = 50
+    # Lines kept in each tab; the oldest are dropped beyond this
+    MAX_LINES = 10000
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         layout = QVBoxLayout(self)
@@ -727,10 +1113,11 @@ class OutputPanel(QWidget):
         """)
         
         # Console tab
-        self.console = QTextEdit()
+        self.console = QPlainTextEdit()
         self.console.setReadOnly(True)
+        self.console.setMaximumBlockCount(self.MAX_LINES)
         self.console.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #00ff00;
                 font-family: Courier New;
@@ -739,10 +1126,11 @@ class OutputPanel(QWidget):
         """)
         
         # Errors tab
-        self.errors = QTextEdit()
+        self.errors = QPlainTextEdit()
         self.errors.setReadOnly(True)
+        self.errors.setMaximumBlockCount(self.MAX_LINES)
         self.errors.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #ff6b6b;
                 font-family: Courier New;
@@ -751,10 +1139,11 @@ class OutputPanel(QWidget):
         """)
         
         # Warnings tab
-        self.warnings = QTextEdit()
+        self.warnings = QPlainTextEdit()
         self.warnings.setReadOnly(True)
+        self.warnings.setMaximumBlockCount(self.MAX_LINES)
         self.warnings.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #ffb86c;
                 font-family: Courier New;
@@ -767,38 +1156,245 @@ class OutputPanel(QWidget):
         self.tabs.addTab(self.warnings, "Warnings")
         
         layout.addWidget(self.tabs)
+        
+        # Drains a running program's output into the console every FLUSH_MS
+        self._console_source = None
+        self._console_timer = QTimer(self)
+        self._console_timer.timeout.connect(self.flush_console)
     
     def clear(self):
         """Clear all output."""
+        self.stop_stream()
         self.console.clear()
         self.errors.clear()
         self.warnings.clear()
     
     def append_console(self, text):
         """Append to console."""
-        self.console.append(text)
+        self.flush_console()
+        self.console.appendPlainText(text)
+    
+    def start_stream(self, source):
+        """Poll source, a callable returning pending program output, every FLUSH_MS."""
+        self._console_source = source
+        self._console_timer.start(self.FLUSH_MS)
+    
+    def stop_stream(self):
+        """Write the last of the streamed output and stop polling."""
+        self.flush_console()
+        self._console_timer.stop()
+        self._console_source = None
+    
+    def flush_console(self):
+        """Write pending program output to the console as-is."""
+        if self._console_source is None:
+            return
+        text = self._console_source()
+        if not text:
+            return
+        self.console.moveCursor(QTextCursor.End)
+        self.console.insertPlainText(text)
     
     def append_error(self, text):
         """Append error."""
-        self.errors.append(f"❌ {text}")
+        self.errors.appendPlainText(f"❌ {text}")
         self.tabs.setCurrentWidget(self.errors)
     
     def append_warning(self, text):
         """Append warning."""
-        self.warnings.append(f"⚠️ {text}")
+        self.warnings.appendPlainText(f"⚠️ {text}")
+
+
+class _ThreadStdout:
+    """sys.stdout stand-in that sends each capturing thread's writes to its own sink.
+    
+    Threads that are not capturing write through to the stream it replaced.
+    """
+    
+    def __init__(self, default):
+        self.default = default
+        self.sinks = {}  # thread ident -> file-like sink
+    
+    def write(self, text):
+        return self.sinks.get(threading.get_ident(), self.default).write(text)
+    
+    def flush(self):
+        self.sinks.get(threading.get_ident(), self.default).flush()
+    
+    def __getattr__(self, name):
+        return getattr(self.default, name)
+
+
+@contextmanager
+def _capture_stdout(sink):
+    """Send the calling thread's writes to sys.stdout into sink; other threads are untouched."""
+    router = sys.stdout
+    if not isinstance(router, _ThreadStdout):
+        # Installed once and left in place, so sys.stdout is never swapped mid-run
+        router = sys.stdout = _ThreadStdout(router)
+    ident = threading.get_ident()
+    router.sinks[ident] = sink
+    try:
+        yield
+    finally:
+        del router.sinks[ident]
+
+
+class _OutputBuffer:
+    """File-like sink for program output, written by the worker and drained by the GUI."""
+    
+    __slots__ = ('_chunks', '_lock')
+    
+    def __init__(self):
+        self._chunks = []
+        self._lock = threading.Lock()
+    
+    def write(self, text):
+        with self._lock:
+            self._chunks.append(text)
+        return len(text)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        """Everything written since the last drain."""
+        with self._lock:
+            chunks, self._chunks = self._chunks, []
+        return ''.join(chunks)
+
+
+# Programs that import the widget wrapper
+_PYQT_IMPORT_RE = re.compile(r'^\s*(?:import|from)\s+pyqt5_wrapper\b', re.MULTILINE)
+
+
+class RunWorker(QThread):
+    """Lexes, parses and interprets a program away from the GUI thread.
+    
+    Calling run() directly instead of start() executes on the calling
+    thread, which programs that build their own widgets need.
+    """
+    
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str, str)  # exception type name, message
+    stopped = pyqtSignal()
+    
+    def __init__(self, source, interpreter, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.interpreter = interpreter
+        self.output = _OutputBuffer()
+    
+    def run(self):
+        """Execute the program, reporting through the signals."""
+        from parser import parse_cached
+        from interpreter import ProgramInterrupted
+        
+        try:
+            # Lex and parse (re-running unchanged source reuses the tree)
+            ast = parse_cached(self.source)
+            
+            # Interpret; print writes to our buffer directly, and anything
+            # else this thread writes to stdout (Python modules, helpers) too
+            self.interpreter.output = self.output
+            try:
+                with _capture_stdout(self.output):
+                    result = self.interpreter.interpret(ast)
+            finally:
+                self.interpreter.output = None
+        except ProgramInterrupted:
+            self.stopped.emit()
+        except Exception as e:
+            self.failed.emit(type(e).__name__, str(e))
+        else:
+            self.succeeded.emit(result)
+
+
+class _FileTaskSignals(QObject):
+    """Signals for FileTask, which as a QRunnable cannot carry its own."""
+    
+    done = pyqtSignal(str, str)    # path, content read (empty after a write)
+    failed = pyqtSignal(str, str)  # path, error message
+
+
+class FileTask(QRunnable):
+    """Reads a file, or writes text to one, on the global thread pool."""
+    
+    # Files at least this big are decoded straight from a memory map
+    MMAP_THRESHOLD = 1 << 20
+    
+    def __init__(self, path, text=None):
+        super().__init__()
+        self.path = path
+        self.text = text
+        self.signals = _FileTaskSignals()
+    
+    def run(self):
+        """Do the I/O, reporting through signals."""
+        try:
+            if self.text is None:
+                content = self._read()
+            else:
+                self._write()
+                content = ''
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
+        else:
+            self.signals.done.emit(self.path, content)
+    
+    def _write(self):
+        """Replace the file with the text in one step, never leaving it half written."""
+        data = self.text.encode('utf-8')
+        # Write through symlinks rather than replacing them
+        path = os.path.realpath(self.path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        if st is None or st.st_nlink > 1:
+            # Nothing to protect yet, or a rename would split the hard links
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+        fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.',
+                                        suffix='.tmp', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _read(self):
+        """The file's text with newlines translated, as text mode would give."""
+        if os.path.getsize(self.path) < self.MMAP_THRESHOLD:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return f.read()
+        
+        # Decode from the mapped pages, skipping a bytes copy of the file
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, 'utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
 
 
 class EditorTab(QWidget):
     """Tab containing editor with line numbers."""
     
-    def __init__(self, filepath=None, parent=None):
+    def __init__(self, filepath=None, parent=None, autocomplete=None):
         super().__init__(parent)
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         
         # Create editor
-        self.editor = SharpEditorWidget()
+        self.editor = SharpEditorWidget(autocomplete=autocomplete)
         
         # Add line numbers
         layout.addWidget(self.editor.line_number_area)
@@ -808,9 +1404,32 @@ class EditorTab(QWidget):
         self.is_modified = False
 
 
+_ABOUT_TEXT = (
+    "Sharp Programming Language IDE v2.0 (PyQt5)\n\n"
+    "Professional Edition with:\n"
+    "✓ Multi-tab Editor\n"
+    "✓ Syntax Highlighting\n"
+    "✓ Intelligent Autocompletion\n"
+    "✓ Line Numbers\n"
+    "✓ File Explorer & Project View\n"
+    "✓ Code Outline/Structure\n"
+    "✓ Find & Replace (Ctrl+F / Ctrl+H)\n"
+    "✓ Go to Line (Ctrl+G)\n"
+    "✓ Bracket Matching\n"
+    "✓ Multi-tab Output Panel\n"
+    "✓ Live Code Execution\n\n"
+    "A modern, Python-like programming language\n"
+    "with powerful features for education and development.\n\n"
+    "© 2026 Sharp Development Team"
+)
+
+
 class SharpIDE(QMainWindow):
     """Professional Sharp IDE in PyQt5 with PyCharm-like features."""
     
+    # Idle time after an edit before the code outline catches up
+    OUTLINE_DELAY_MS = 500
+    
     def __init__(self):
         super().__init__()
         
@@ -878,13 +1497,22 @@ class SharpIDE(QMainWindow):
         """)
         
         self.current_file = None
-        self.interpreter = Interpreter()
+        self.interpreter = None
+        self.run_worker = None
+        self.autocomplete = AutocompleteWidget(self)  # shared by all editor tabs
+        self.autocomplete.hide()
         self.open_files = {}  # filepath -> EditorTab
+        self._loading_files = set()  # paths being read in the background
+        
+        # The outline follows the current editor once typing goes idle
+        self._outline_timer = QTimer(self)
+        self._outline_timer.setSingleShot(True)
+        self._outline_timer.timeout.connect(self._refresh_outline)
         self.current_editor = None
         
-        # Dialogs
-        self.find_replace_dialog = FindReplaceDialog(self)
-        self.go_to_line_dialog = GoToLineDialog(self)
+        # Dialogs, built the first time they are needed
+        self._find_replace_dialog = None
+        self._go_to_line_dialog = None
         
         # Create UI
         self.create_menu_bar()
@@ -895,6 +1523,20 @@ class SharpIDE(QMainWindow):
         # Shortcuts
         self.setup_shortcuts()
     
+    @property
+    def find_replace_dialog(self):
+        """The find and replace dialog, created on first use."""
+        if self._find_replace_dialog is None:
+            self._find_replace_dialog = FindReplaceDialog(self)
+        return self._find_replace_dialog
+    
+    @property
+    def go_to_line_dialog(self):
+        """The go to line dialog, created on first use."""
+        if self._go_to_line_dialog is None:
+            self._go_to_line_dialog = GoToLineDialog(self)
+        return self._go_to_line_dialog
+    
     def create_menu_bar(self):
         """Create the menu bar with advanced features."""
         menubar = self.menuBar()
@@ -957,6 +1599,11 @@ class SharpIDE(QMainWindow):
         run_action.triggered.connect(self.run_code)
         run_menu.addAction(run_action)
         
+        stop_action = QAction("Stop (Shift+F5)", self)
+        stop_action.setShortcut("Shift+F5")
+        stop_action.triggered.connect(self.stop_code)
+        run_menu.addAction(stop_action)
+        
         # Help menu
         help_menu = menubar.addMenu("Help")
         
@@ -1008,6 +1655,15 @@ class SharpIDE(QMainWindow):
                 image: url(:/close.png);
                 background-color: transparent;
             }
+            SharpEditorWidget {
+                background-color: #1e1e1e;
+                color: #d4d4d4;
+                border: none;
+            }
+            LineNumberArea {
+                background-color: #252526;
+                border-right: 1px solid #3e3e42;
+            }
         """)
         self.editor_tabs.setTabsClosable(True)
         self.editor_tabs.tabCloseRequested.connect(self.close_tab)
@@ -1027,11 +1683,14 @@ class SharpIDE(QMainWindow):
     
     def _create_new_tab(self, filename, filepath=None):
         """Create a new editor tab."""
-        tab = EditorTab(filepath)
+        tab = EditorTab(filepath, autocomplete=self.autocomplete)
         self.editor_tabs.addTab(tab, os.path.basename(filename))
         
         # Connect signals
-        tab.editor.textChanged.connect(lambda: self._on_editor_modified(tab))
+        tab.editor.document().modificationChanged.connect(
+            lambda modified: self._on_editor_modified(tab, modified))
+        tab.editor.textChanged.connect(lambda: self._schedule_outline(tab.editor))
+        tab.editor.cursorPositionChanged.connect(self._update_cursor_position)
         
         self.open_files[filepath or filename] = tab
         return tab
@@ -1042,9 +1701,23 @@ class SharpIDE(QMainWindow):
             tab = self.editor_tabs.widget(index)
             if tab:
                 self.current_editor = tab.editor
-                self.find_replace_dialog.set_editor(self.current_editor)
-                self.go_to_line_dialog.set_editor(self.current_editor)
+                if self._find_replace_dialog is not None:
+                    self._find_replace_dialog.set_editor(self.current_editor)
+                if self._go_to_line_dialog is not None:
+                    self._go_to_line_dialog.set_editor(self.current_editor)
                 self.current_file = tab.filepath
+                self._update_cursor_position()
+                self._outline_timer.start(0)
+    
+    def _schedule_outline(self, editor):
+        """Refresh the outline once the current editor has been idle a while."""
+        if editor is self.current_editor:
+            self._outline_timer.start(self.OUTLINE_DELAY_MS)
+    
+    def _refresh_outline(self):
+        """Show the structure of the current editor's code while the outline is on screen."""
+        if self.current_editor is not None and self.code_outline.isVisible():
+            self.code_outline.parse_code(self.current_editor.toPlainText())
     
     def close_tab(self, index):
         """Close a tab."""
@@ -1056,17 +1729,25 @@ class SharpIDE(QMainWindow):
                 if reply == QMessageBox.Yes:
                     self.save_file()
             
+            self.autocomplete.detach(tab.editor, self)
             self.editor_tabs.removeTab(index)
-            if tab.filepath:
-                del self.open_files[tab.filepath]
-    
-    def _on_editor_modified(self, tab):
-        """Mark editor as modified."""
-        tab.is_modified = True
+            self._forget_tab(tab)
+            if tab.editor is self.current_editor:
+                self.current_editor = None
+            # removeTab leaves the widget parented to the tab stack
+            tab.deleteLater()
+    
+    def _forget_tab(self, tab):
+        """Drop every open_files entry that refers to tab."""
+        for key in [key for key, value in self.open_files.items() if value is tab]:
+            del self.open_files[key]
+    
+    def _on_editor_modified(self, tab, modified):
+        """Mark a tab modified or saved; called only when that state flips."""
+        tab.is_modified = modified
         index = self.editor_tabs.indexOf(tab)
-        title = self.editor_tabs.tabText(index)
-        if not title.endswith("*"):
-            self.editor_tabs.setTabText(index, title + "*")
+        title = self.editor_tabs.tabText(index).rstrip('*')
+        self.editor_tabs.setTabText(index, title + "*" if modified else title)
     
     def create_sidebars(self):
         """Create left and right sidebars with panels."""
@@ -1108,6 +1789,10 @@ class SharpIDE(QMainWindow):
         left_dock.setWidget(left_widget)
         self.addDockWidget(Qt.LeftDockWidgetArea, left_dock)
         
+        # The outline is only kept current while it can be seen
+        self.left_tabs.currentChanged.connect(lambda: self._outline_timer.start(0))
+        left_dock.visibilityChanged.connect(lambda: self._outline_timer.start(0))
+        
         # Right sidebar - Properties and info
         right_dock = QDockWidget("Info", self)
         right_dock.setAllowedAreas(Qt.RightDockWidgetArea)
@@ -1180,36 +1865,52 @@ class SharpIDE(QMainWindow):
         self.setWindowTitle("Sharp IDE - Untitled")
     
     def open_file(self, filepath=None):
-        """Open a file."""
+        """Open a file; it is read off the GUI thread and shown when ready."""
         if not filepath:
             filepath, _ = QFileDialog.getOpenFileName(self, "Open Sharp Program",
                                                       "", "Sharp Files (*.sharp);;Text Files (*.txt);;All Files (*.*)")
         
         if filepath:
-            try:
-                # Check if already open
-                if filepath in self.open_files:
-                    self.editor_tabs.setCurrentWidget(self.open_files[filepath])
-                    return
-                
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                tab = self._create_new_tab(os.path.basename(filepath), filepath)
-                tab.editor.setPlainText(content)
-                tab.is_modified = False
-                
-                # Update code outline
-                self.code_outline.parse_code(content)
-                
-                self.editor_tabs.setCurrentWidget(tab)
-                self.current_file = filepath
-                self.setWindowTitle(f"Sharp IDE - {os.path.basename(filepath)}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not open file: {e}")
+            # Check if already open
+            if filepath in self.open_files:
+                self.editor_tabs.setCurrentWidget(self.open_files[filepath])
+                return
+            if filepath in self._loading_files:
+                return
+            
+            self._loading_files.add(filepath)
+            task = FileTask(filepath)
+            task.signals.done.connect(self._on_file_loaded)
+            task.signals.failed.connect(self._on_file_load_failed)
+            QThreadPool.globalInstance().start(task)
+            self.update_status(f"Opening: {filepath}")
+    
+    def _on_file_loaded(self, filepath, content):
+        """Show a file that has finished loading."""
+        self._loading_files.discard(filepath)
+        tab = self._create_new_tab(os.path.basename(filepath), filepath)
+        
+        # Install the text with the highlighter detached; re-attaching it
+        # queues a single pass that runs once the tab has been laid out
+        document = tab.editor.document()
+        tab.editor.highlighter.setDocument(None)
+        tab.editor.setPlainText(content)
+        document.setModified(False)
+        tab.editor.highlighter.setDocument(document)
+        
+        # Switching to the tab refreshes the code outline
+        self.editor_tabs.setCurrentWidget(tab)
+        self.current_file = filepath
+        self.setWindowTitle(f"Sharp IDE - {os.path.basename(filepath)}")
+        self.update_status(f"Opened: {filepath}")
+    
+    def _on_file_load_failed(self, filepath, message):
+        """Report a file that could not be read."""
+        self._loading_files.discard(filepath)
+        QMessageBox.critical(self, "Error", f"Could not open file: {message}")
     
     def save_file(self):
-        """Save the current file."""
+        """Save the current file; the text is written off the GUI thread."""
         tab = self.editor_tabs.currentWidget()
         if not tab:
             return
@@ -1218,16 +1919,20 @@ class SharpIDE(QMainWindow):
             self.save_as_file()
             return
         
-        try:
-            with open(tab.filepath, 'w', encoding='utf-8') as f:
-                f.write(tab.editor.toPlainText())
-            tab.is_modified = False
-            index = self.editor_tabs.indexOf(tab)
-            title = self.editor_tabs.tabText(index).rstrip('*')
-            self.editor_tabs.setTabText(index, title)
-            self.update_status(f"Saved: {tab.filepath}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not save file: {e}")
+        # Edits made while the write is in flight keep the tab modified
+        revision = tab.editor.document().revision()
+        task = FileTask(tab.filepath, tab.editor.toPlainText())
+        task.signals.done.connect(lambda path, _: self._on_file_saved(path, revision))
+        task.signals.failed.connect(
+            lambda path, message: QMessageBox.critical(self, "Error", f"Could not save file: {message}"))
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_file_saved(self, filepath, revision):
+        """Mark a tab saved once its text is on disk, unless it was closed meanwhile."""
+        tab = self.open_files.get(filepath)
+        if tab is not None and tab.editor.document().revision() == revision:
+            tab.editor.document().setModified(False)
+        self.update_status(f"Saved: {filepath}")
     
     def save_as_file(self):
         """Save file with a new name."""
@@ -1237,8 +1942,11 @@ class SharpIDE(QMainWindow):
             tab = self.editor_tabs.currentWidget()
             if tab:
                 tab.filepath = filename
+                self._forget_tab(tab)
+                self.open_files[filename] = tab
                 self.current_file = filename
-                self.editor_tabs.setTabText(self.editor_tabs.indexOf(tab), os.path.basename(filename))
+                self.editor_tabs.setTabText(self.editor_tabs.indexOf(tab),
+                                            os.path.basename(filename) + ("*" if tab.is_modified else ""))
                 self.setWindowTitle(f"Sharp IDE - {os.path.basename(filename)}")
                 self.save_file()
     
@@ -1254,75 +1962,75 @@ class SharpIDE(QMainWindow):
             QMessageBox.warning(self, "Warning", "No code to execute")
             return
         
+        if self.run_worker is not None:
+            self.update_status("Already running")
+            return
+        
         self.output_panel.clear()
         self.update_status("Running...")
         
-        # Check for PyQt5
-        if 'import pyqt5_wrapper' in source or 'from pyqt5_wrapper' in source:
-            try:
-                import PyQt5
-            except ImportError:
-                self.output_panel.append_error("PyQt5 is not installed. Please install it with: pip install PyQt5")
-                self.update_status("PyQt5 missing")
-                return
-        
-        # Capture output
-        old_stdout = sys.stdout
-        sys.stdout = StringIO()
+        # Programs that build widgets must run on the GUI thread
+        on_gui_thread = _PYQT_IMPORT_RE.search(source) is not None
         
-        try:
-            # Lex
-            lexer = Lexer(source)
-            tokens = lexer.tokenize()
-            
-            # Parse
-            parser = Parser(tokens)
-            ast = parser.parse()
-            
-            # Interpret
+        # One interpreter serves every run, reset to a clean state each time
+        if self.interpreter is None:
+            from interpreter import Interpreter
             self.interpreter = Interpreter()
-            result = self.interpreter.interpret(ast)
-            
-            # Get output
-            output = sys.stdout.getvalue()
-            
-            if output:
-                self.output_panel.append_console(output)
-            
-            self.update_status("Execution completed successfully")
-            
-            if result and not isinstance(result, SharpNil):
-                self.output_panel.append_console(f"\n✓ Result: {result}\n")
-        
-        except SyntaxError as e:
-            self.output_panel.append_error(f"SyntaxError: {e}")
+        else:
+            self.interpreter.reset()
+        worker = RunWorker(source, self.interpreter, self)
+        self.output_panel.start_stream(worker.output.drain)
+        worker.succeeded.connect(self._on_run_succeeded)
+        worker.failed.connect(self._on_run_failed)
+        worker.stopped.connect(lambda: self.update_status("Stopped"))
+        self.run_worker = worker
+        
+        if on_gui_thread:
+            worker.run()
+            self._on_run_finished()
+        else:
+            worker.finished.connect(self._on_run_finished)
+            worker.start()
+    
+    def stop_code(self):
+        """Stop the running program at its next loop iteration or call."""
+        if self.run_worker is not None:
+            self.interpreter.request_interrupt()
+            self.update_status("Stopping...")
+    
+    def _on_run_succeeded(self, result):
+        """Report a program that ran to completion."""
+        self.update_status("Execution completed successfully")
+        
+        if result and not isinstance(result, SharpNil):
+            self.output_panel.append_console(f"\n✓ Result: {result}\n")
+    
+    def _on_run_failed(self, error_type, message):
+        """Report a program that raised."""
+        self.output_panel.append_error(f"{error_type}: {message}")
+        if error_type == 'SyntaxError':
             self.update_status("Syntax error")
-        except Exception as e:
-            self.output_panel.append_error(f"{type(e).__name__}: {e}")
-            self.update_status(f"Error - {type(e).__name__}")
-        
-        finally:
-            sys.stdout = old_stdout
+        else:
+            self.update_status(f"Error - {error_type}")
+    
+    def _on_run_finished(self):
+        """Write out the last of the output and release the worker."""
+        self.output_panel.stop_stream()
+        self.run_worker.deleteLater()
+        self.run_worker = None
+    
+    def closeEvent(self, event):
+        """Stop background threads before the window goes away."""
+        # A QThread destroyed while running aborts the process
+        if self.run_worker is not None:
+            self.interpreter.request_interrupt()
+            self.run_worker.wait()
+        self.code_outline.shutdown()
+        super().closeEvent(event)
     
     def show_about(self):
         """Show about dialog."""
-        QMessageBox.information(self, "About Sharp IDE",
-            "Sharp Programming Language IDE v2.0 (PyQt5)\n\n"
-            "Professional Edition with:\n"
-            "✓ Multi-tab Editor\n"
-            "✓ Syntax Highlighting\n"
-            "✓ Intelligent Autocompletion\n"
-            "✓ Line Numbers\n"
-            "✓ File Explorer & Project View\n"
-            "✓ Code Outline/Structure\n"
-            "✓ Find & Replace (Ctrl+F / Ctrl+H)\n"
-            "✓ Go to Line (Ctrl+G)\n"
-            "✓ Bracket Matching\n"
-            "✓ Multi-tab Output Panel\n"
-            "✓ Live Code Execution\n\n"
-            "A modern, Python-like programming language\n"
-            "with powerful features for education and development.\n\n"
-            "© 2026 Sharp Development Team")
+        QMessageBox.information(self, "About Sharp IDE", _ABOUT_TEXT)
 
 
 def main():
@@ -4,7 +4,9 @@ Evaluates AST and executes Sharp programs.
 """
 
 import math
+import operator
 import os
+import threading
 from typing import Any, Dict, Optional, List
 from ast_nodes import *
 from stdlib import (
@@ -12,6 +14,44 @@ from stdlib import (
     ReturnValue, BreakException, ContinueException, STDLIB
 )
 
+def _divide(left: Any, right: Any) -> Any:
+    """Sharp division: integer division when both operands are ints."""
+    if isinstance(left, int) and isinstance(right, int):
+        return left // right
+    return left / right
+
+def _contains(left: Any, right: Any) -> bool:
+    """Membership test (``left in right``)."""
+    return left in right
+
+# Binary operator implementations, indexed by Operator code
+BINARY_OPERATIONS = (
+    operator.add,       # ADD
+    operator.sub,       # SUB
+    operator.mul,       # MUL
+    _divide,            # DIV
+    operator.mod,       # MOD
+    operator.pow,       # POW
+    operator.eq,        # EQ
+    operator.ne,        # NE
+    operator.lt,        # LT
+    operator.le,        # LE
+    operator.gt,        # GT
+    operator.ge,        # GE
+    _contains,          # IN
+    operator.and_,      # BIT_AND
+    operator.or_,       # BIT_OR
+    operator.xor,       # BIT_XOR
+    operator.lshift,    # LSHIFT
+    operator.rshift,    # RSHIFT
+)
+
+UNARY_OPERATIONS = {
+    Operator.POS: operator.pos,
+    Operator.NEG: operator.neg,
+    Operator.INVERT: operator.invert,
+}
+
 # Exception types for Sharp
 class SharpException(Exception):
     """Base class for Sharp exceptions."""
@@ -21,6 +61,10 @@ class SharpRuntimeError(SharpException):
     """Runtime error in Sharp."""
     pass
 
+class ProgramInterrupted(BaseException):
+    """Raised when a running program is asked to stop; Sharp code cannot catch it."""
+    pass
+
 # Class representation in Sharp
 class SharpClass:
     """Represents a Sharp class."""
@@ -76,12 +120,43 @@ class Interpreter:
     """Interprets and executes Sharp AST."""
     
     def __init__(self):
+        # File-like target of the Sharp print builtin; None means sys.stdout
+        self.output = None
+        self.reset()
+        # Assignment handlers indexed by AssignKind
+        self.assignment_handlers = (
+            self.eval_declare, self.eval_assign,
+            self.eval_augmented_assign, self.eval_unpack_assign,
+        )
+    
+    def reset(self):
+        """Forget everything a program defined, leaving only the standard library."""
         self.global_env = Environment()
         # Load standard library
-        for name, value in STDLIB.items():
-            self.global_env.define(name, value)
+        self.global_env.variables.update(STDLIB)
+        self.global_env.define('print', SharpBuiltin('print', self.builtin_print))
+        self.global_env.define('sleep', SharpBuiltin('sleep', self.builtin_sleep))
         self.current_env = self.global_env
         self.loaded_modules = {}  # Cache for loaded modules
+        self.interrupted = False
+        # Set with interrupted, so a sleeping program wakes up to stop
+        self._interrupt_event = threading.Event()
+    
+    def builtin_print(self, *args):
+        """Print function, writing to this interpreter's output."""
+        print(" ".join(str(arg) for arg in args), file=self.output)
+        return SharpNil()
+    
+    def builtin_sleep(self, seconds):
+        """Sleep for seconds, returning early if the program is interrupted."""
+        if self._interrupt_event.wait(seconds):
+            raise ProgramInterrupted()
+        return SharpNil()
+    
+    def request_interrupt(self):
+        """Ask the running program to stop at its next loop iteration or call."""
+        self.interrupted = True
+        self._interrupt_event.set()
     
     def load_module(self, module_name: str) -> Dict[str, Any]:
         """Load a Sharp or Python module and return its exports."""
@@ -194,7 +269,7 @@ class Interpreter:
             return [self.evaluate(elem) for elem in node.elements]
         
         elif isinstance(node, DictLiteral):
-            return {self.evaluate(k): self.evaluate(v) for k, v in node.pairs}
+            return {self.evaluate(pair.key): self.evaluate(pair.value) for pair in node.pairs}
         
         elif isinstance(node, TupleLiteral):
             return tuple(self.evaluate(elem) for elem in node.elements)
@@ -202,10 +277,8 @@ class Interpreter:
         elif isinstance(node, Identifier):
             return self.current_env.get(node.name)
         
-        elif isinstance(node, VarDecl):
-            value = self.evaluate(node.value)
-            self.current_env.define(node.name, value)
-            return value
+        elif isinstance(node, Assignment):
+            return self.assignment_handlers[node.kind](node)
         
         elif isinstance(node, BinaryOp):
             return self.eval_binary_op(node)
@@ -213,22 +286,8 @@ class Interpreter:
         elif isinstance(node, UnaryOp):
             return self.eval_unary_op(node)
         
-        elif isinstance(node, Assignment):
-            value = self.evaluate(node.value)
-            self.current_env.set(node.target, value)
-            return value
-        
-        elif isinstance(node, AugmentedAssignment):
-            current = self.current_env.get(node.target)
-            value = self.evaluate(node.value)
-            result = self.apply_binary_op(current, node.op, value)
-            self.current_env.set(node.target, result)
-            return result
-        
         elif isinstance(node, FunctionDef):
-            func = SharpFunction(node.name, node.params, node.defaults, node.body, self.current_env)
-            self.current_env.define(node.name, func)
-            return SharpNil()
+            return self.eval_function_def(node)
         
         elif isinstance(node, FunctionCall):
             return self.eval_function_call(node)
@@ -271,14 +330,7 @@ class Interpreter:
             return obj[start:end:step]
         
         elif isinstance(node, AttributeAccess):
-            obj = self.evaluate(node.obj)
-            # Handle SharpModule specially
-            if isinstance(obj, SharpModule):
-                exports = obj.exports
-                if node.attr in exports:
-                    return exports[node.attr]
-                raise AttributeError(f"Module '{obj.name}' has no attribute '{node.attr}'")
-            return getattr(obj, node.attr)
+            return self.get_attribute(self.evaluate(node.obj), node.attr)
         
         elif isinstance(node, ListComprehension):
             return self.eval_list_comprehension(node)
@@ -286,9 +338,6 @@ class Interpreter:
         elif isinstance(node, DictComprehension):
             return self.eval_dict_comprehension(node)
         
-        elif isinstance(node, TypeDef):
-            return self.eval_type_def(node)
-        
         elif isinstance(node, ImportStmt):
             # Load module and optionally alias it
             module_exports = self.load_module(node.module)
@@ -309,7 +358,8 @@ class Interpreter:
             module_exports = self.load_module(node.module)
             
             # Import requested items
-            for item_name, alias in node.items:
+            for item in node.items:
+                item_name = item.name
                 if item_name == '*':
                     # Import all
                     for name, value in module_exports.items():
@@ -320,7 +370,7 @@ class Interpreter:
                         raise ImportError(f"Cannot import name '{item_name}' from '{node.module}'")
                     
                     # Use alias if provided, otherwise use original name
-                    import_as = alias if alias else item_name
+                    import_as = item.alias if item.alias else item_name
                     self.current_env.define(import_as, module_exports[item_name])
             
             return SharpNil()
@@ -331,12 +381,6 @@ class Interpreter:
         elif isinstance(node, ClassDef):
             return self.eval_class_def(node)
         
-        elif isinstance(node, DecoratedFunction):
-            return self.eval_decorated_function(node)
-        
-        elif isinstance(node, DecoratedClass):
-            return self.eval_decorated_class(node)
-        
         elif isinstance(node, TryStmt):
             return self.eval_try_stmt(node)
         
@@ -349,18 +393,9 @@ class Interpreter:
         elif isinstance(node, YieldStmt):
             return self.eval_yield_stmt(node)
         
-        elif isinstance(node, AsyncFunctionDef):
-            return self.eval_async_function_def(node)
-        
         elif isinstance(node, AwaitExpr):
             return self.eval_await_expr(node)
         
-        elif isinstance(node, AsyncForLoop):
-            return self.eval_async_for_loop(node)
-        
-        elif isinstance(node, AsyncWithStmt):
-            return self.eval_async_with_stmt(node)
-        
         elif isinstance(node, GlobalStmt):
             return self.eval_global_stmt(node)
         
@@ -371,18 +406,41 @@ class Interpreter:
             return self.interpret(node)
         
         else:
-            raise RuntimeError(f"Unknown AST node type: {type(node).__name__}")
+            return self.eval_rare_node(node)
+
+    def eval_rare_node(self, node: ASTNode) -> Any:
+        """Evaluate nodes from ast_nodes_rare, importing them on first use."""
+        from ast_nodes import TypeDef, DecoratedClass, AsyncForLoop, AsyncWithStmt
+        if isinstance(node, TypeDef):
+            return self.eval_type_def(node)
+        elif isinstance(node, DecoratedClass):
+            return self.eval_decorated_class(node)
+        elif isinstance(node, AsyncForLoop):
+            return self.eval_async_for_loop(node)
+        elif isinstance(node, AsyncWithStmt):
+            return self.eval_async_with_stmt(node)
+        raise RuntimeError(f"Unknown AST node type: {type(node).__name__}")
+    
+    def get_attribute(self, obj: Any, attr: str) -> Any:
+        """Look up an attribute, resolving module exports."""
+        # Handle SharpModule specially
+        if isinstance(obj, SharpModule):
+            exports = obj.exports
+            if attr in exports:
+                return exports[attr]
+            raise AttributeError(f"Module '{obj.name}' has no attribute '{attr}'")
+        return getattr(obj, attr)
     
     def eval_binary_op(self, node: BinaryOp) -> Any:
         """Evaluate binary operation."""
         # Short-circuit evaluation for logical operators
-        if node.op == 'and':
+        if node.op == Operator.AND:
             left = self.evaluate(node.left)
             if not self.is_truthy(left):
                 return left
             return self.evaluate(node.right)
         
-        elif node.op == 'or':
+        elif node.op == Operator.OR:
             left = self.evaluate(node.left)
             if self.is_truthy(left):
                 return left
@@ -393,75 +451,79 @@ class Interpreter:
         right = self.evaluate(node.right)
         return self.apply_binary_op(left, node.op, right)
     
-    def apply_binary_op(self, left: Any, op: str, right: Any) -> Any:
+    def apply_binary_op(self, left: Any, op: Operator, right: Any) -> Any:
         """Apply binary operator."""
-        if op == '+':
-            return left + right
-        elif op == '-':
-            return left - right
-        elif op == '*':
-            return left * right
-        elif op == '/':
-            if isinstance(left, int) and isinstance(right, int):
-                return left // right  # Integer division
-            return left / right
-        elif op == '%':
-            return left % right
-        elif op == '**':
-            return left ** right
-        elif op == '==':
-            return left == right
-        elif op == '!=':
-            return left != right
-        elif op == '<':
-            return left < right
-        elif op == '<=':
-            return left <= right
-        elif op == '>':
-            return left > right
-        elif op == '>=':
-            return left >= right
-        elif op == '&':
-            return left & right
-        elif op == '|':
-            return left | right
-        elif op == '^':
-            return left ^ right
-        elif op == '<<':
-            return left << right
-        elif op == '>>':
-            return left >> right
-        elif op == 'in':
-            # Membership test operator
-            return left in right
-        else:
-            raise RuntimeError(f"Unknown binary operator: {op}")
+        if op < len(BINARY_OPERATIONS):
+            return BINARY_OPERATIONS[op](left, right)
+        raise RuntimeError(f"Unknown binary operator: {op}")
     
     def eval_unary_op(self, node: UnaryOp) -> Any:
         """Evaluate unary operation."""
         operand = self.evaluate(node.operand)
         
-        if node.op == '-':
-            return -operand
-        elif node.op == '+':
-            return +operand
-        elif node.op == 'not':
+        if node.op == Operator.NOT:
             return not self.is_truthy(operand)
-        elif node.op == '~':
-            return ~operand
-        else:
+        
+        operation = UNARY_OPERATIONS.get(node.op)
+        if operation is None:
             raise RuntimeError(f"Unknown unary operator: {node.op}")
+        return operation(operand)
     
+    def eval_declare(self, node: Assignment) -> Any:
+        """Evaluate ``let x = value``: define in the current scope."""
+        value = self.evaluate(node.value)
+        self.current_env.define(node.targets[0], value)
+        return value
+
+    def eval_assign(self, node: Assignment) -> Any:
+        """Evaluate ``x = value``: set through enclosing scopes."""
+        value = self.evaluate(node.value)
+        self.current_env.set(node.targets[0], value)
+        return value
+
+    def eval_augmented_assign(self, node: Assignment) -> Any:
+        """Evaluate ``x op= value``."""
+        target = node.targets[0]
+        current = self.current_env.get(target)
+        value = self.evaluate(node.value)
+        result = self.apply_binary_op(current, node.op, value)
+        self.current_env.set(target, result)
+        return result
+
+    def eval_unpack_assign(self, node: Assignment) -> Any:
+        """Evaluate ``a, b, *rest = value``."""
+        source = self.evaluate(node.value)
+        values = list(source)
+        targets = node.targets
+        starred = [i for i, name in enumerate(targets) if name.startswith('*')]
+        if starred:
+            i = starred[0]
+            after = len(targets) - i - 1
+            if len(values) < len(targets) - 1:
+                raise SharpRuntimeError(f"Not enough values to unpack (expected at least {len(targets) - 1}, got {len(values)})")
+            values = values[:i] + [values[i:len(values) - after]] + values[len(values) - after:]
+            targets = targets[:i] + (targets[i][1:],) + targets[i + 1:]
+        elif len(values) != len(targets):
+            raise SharpRuntimeError(f"Expected {len(targets)} values to unpack, got {len(values)}")
+        for name, value in zip(targets, values):
+            self.current_env.set(name, value)
+        return source
+
     def eval_function_call(self, node: FunctionCall) -> Any:
         """Evaluate function call."""
         func = self.evaluate(node.func)
         args = [self.evaluate(arg) for arg in node.args]
-        kwargs = {k: self.evaluate(v) for k, v in node.kwargs.items()}
+        if node.kw_names:
+            kwargs = dict(zip(node.kw_names, [self.evaluate(v) for v in node.kw_values]))
+        else:
+            kwargs = {}
         
         return self.call_function(func, args, kwargs)
     
     def call_function(self, func: Any, args: List[Any], kwargs: dict) -> Any:
         """Call a function (Sharp, builtin, or Python)."""
+        if self.interrupted:
+            raise ProgramInterrupted()
         
         if isinstance(func, SharpBuiltin):
             # Special handling for higher-order functions that take callables
@@ -515,7 +577,7 @@ class Interpreter:
             try:
                 result = SharpNil()
                 # Handle both statement lists and single expressions (lambdas)
-                if isinstance(func.body, list):
+                if isinstance(func.body, tuple):
                     for stmt in func.body:
                         result = self.evaluate(stmt)
                 else:
@@ -577,11 +639,11 @@ class Interpreter:
             return result
         
         # Check elif conditions
-        for elif_cond, elif_body in node.elif_parts:
-            elif_condition = self.evaluate(elif_cond)
+        for elif_part in node.elif_parts:
+            elif_condition = self.evaluate(elif_part.condition)
             if self.is_truthy(elif_condition):
                 result = SharpNil()
-                for stmt in elif_body:
+                for stmt in elif_part.body:
                     result = self.evaluate(stmt)
                 return result
         
@@ -599,6 +661,8 @@ class Interpreter:
         result = SharpNil()
         
         while self.is_truthy(self.evaluate(node.condition)):
+            if self.interrupted:
+                raise ProgramInterrupted()
             try:
                 for stmt in node.body:
                     result = self.evaluate(stmt)
@@ -615,6 +679,8 @@ class Interpreter:
         result = SharpNil()
         
         for item in iterable:
+            if self.interrupted:
+                raise ProgramInterrupted()
             self.current_env.set(node.target, item)
             try:
                 for stmt in node.body:
@@ -630,13 +696,13 @@ class Interpreter:
         """Evaluate match expression."""
         value = self.evaluate(node.value)
         
-        for pattern, body in node.cases:
-            pattern_value = self.evaluate(pattern)
+        for case in node.cases:
+            pattern_value = self.evaluate(case.pattern)
             
             # Simple pattern matching: check equality
             if value == pattern_value:
                 result = SharpNil()
-                for stmt in body:
+                for stmt in case.body:
                     result = self.evaluate(stmt)
                 return result
         
@@ -681,11 +747,11 @@ class Interpreter:
         
         return result
     
-    def eval_type_def(self, node: TypeDef) -> Any:
+    def eval_type_def(self, node: 'TypeDef') -> Any:
         """Evaluate type definition."""
         variants = {}
-        for variant_name, fields in node.variants:
-            variants[variant_name] = fields
+        for variant in node.variants:
+            variants[variant.name] = variant.fields
         
         type_obj = SharpType(node.name, variants)
         self.current_env.define(node.name, type_obj)
@@ -729,16 +795,16 @@ class Interpreter:
         self.current_env = class_env
         
         for stmt in node.body:
-            if isinstance(stmt, FunctionDef):
-                # Methods
+            if isinstance(stmt, FunctionDef) and not (stmt.decorators or stmt.is_async):
+                # Methods (decorated and async defs run as plain statements)
                 func = SharpFunction(stmt.name, stmt.params, stmt.defaults, stmt.body, class_env)
                 methods[stmt.name] = func
                 class_env.define(stmt.name, func)
-            elif isinstance(stmt, VarDecl):
+            elif isinstance(stmt, Assignment) and stmt.kind == AssignKind.DECLARE:
                 # Class attributes
                 value = self.evaluate(stmt.value)
-                attributes[stmt.name] = value
-                class_env.define(stmt.name, value)
+                attributes[stmt.target] = value
+                class_env.define(stmt.target, value)
             else:
                 self.evaluate(stmt)
         
@@ -750,10 +816,18 @@ class Interpreter:
         
         return sharp_class
 
-    def eval_decorated_function(self, node: DecoratedFunction):
-        """Evaluate decorated function."""
-        func = self.evaluate(node.func)
-        
+    def eval_function_def(self, node: FunctionDef) -> Any:
+        """Evaluate function definition (plain, async or decorated)."""
+        # Async functions are treated like regular functions for now
+        # Full async support would require asyncio integration
+        func = SharpFunction(node.name, node.params, node.defaults, node.body, self.current_env)
+        self.current_env.define(node.name, func)
+        if node.decorators:
+            return self.eval_decorated_function(node, func)
+        return SharpNil()
+
+    def eval_decorated_function(self, node: FunctionDef, func: SharpFunction):
+        """Apply a function definition's decorators."""
         # Apply decorators from bottom to top
         for decorator in reversed(node.decorators):
             try:
@@ -765,14 +839,15 @@ class Interpreter:
                 if decorator.args:
                     args = [self.evaluate(arg) for arg in decorator.args]
                     # Call decorator with arguments, then with function
-                    dec_with_args = self.call_function(dec_func, args)
-                    func = self.call_function(dec_with_args, [func])
+                    dec_with_args = self.call_function(dec_func, args, {})
+                    func = self.call_function(dec_with_args, [func], {})
                 else:
-                    func = self.call_function(dec_func, [func])
+                    func = self.call_function(dec_func, [func], {})
         
+        self.current_env.define(node.name, func)
         return func
 
-    def eval_decorated_class(self, node: DecoratedClass):
+    def eval_decorated_class(self, node: 'DecoratedClass'):
         """Evaluate decorated class."""
         cls = self.evaluate(node.cls)
         
@@ -880,21 +955,13 @@ class Interpreter:
             return self.evaluate(node.value)
         return SharpNil()
 
-    def eval_async_function_def(self, node: AsyncFunctionDef):
-        """Evaluate async function definition."""
-        # For now, treat async functions like regular functions
-        # Full async support would require asyncio integration
-        func = SharpFunction(node.name, node.params, node.defaults, node.body, self.current_env)
-        self.current_env.define(node.name, func)
-        return SharpNil()
-
     def eval_await_expr(self, node: AwaitExpr):
         """Evaluate await expression."""
         # For now, just evaluate the expression
         # Full async support would require asyncio integration
         return self.evaluate(node.value)
 
-    def eval_async_for_loop(self, node: AsyncForLoop):
+    def eval_async_for_loop(self, node: 'AsyncForLoop'):
         """Evaluate async for loop."""
         # For now, treat like regular for loop
         iterable = self.evaluate(node.iterable)
@@ -921,7 +988,7 @@ class Interpreter:
         
         return result
 
-    def eval_async_with_stmt(self, node: AsyncWithStmt):
+    def eval_async_with_stmt(self, node: 'AsyncWithStmt'):
         """Evaluate async with statement."""
         # For now, treat like regular with statement
         context = self.evaluate(node.context_expr)
@@ -10,10 +10,10 @@ This file contains evaluation methods for:
 """
 
 from ast_nodes import (
-    ClassDef, DecoratedFunction, DecoratedClass,
+    ClassDef, DecoratedClass,
     TryStmt, RaiseStmt, WithStmt, YieldStmt,
-    AsyncFunctionDef, AwaitExpr, AsyncForLoop, AsyncWithStmt,
-    FunctionDef, VarDecl
+    AwaitExpr, AsyncForLoop, AsyncWithStmt,
+    FunctionDef, Assignment, AssignKind
 )
 
 def eval_class_def(self, node: ClassDef) -> 'SharpClass':
@@ -38,10 +38,10 @@ def eval_class_def(self, node: ClassDef) -> 'SharpClass':
             # Methods
             func = self.eval_function_def(stmt, class_env)
             methods[stmt.name] = func
-        elif isinstance(stmt, VarDecl):
+        elif isinstance(stmt, Assignment) and stmt.kind == AssignKind.DECLARE:
             # Class attributes
             value = self.eval(stmt.value, class_env)
-            attributes[stmt.name] = value
+            attributes[stmt.target] = value
         else:
             self.eval(stmt, class_env)
     
@@ -51,9 +51,9 @@ def eval_class_def(self, node: ClassDef) -> 'SharpClass':
     
     return sharp_class
 
-def eval_decorated_function(self, node: DecoratedFunction, env: Environment):
+def eval_decorated_function(self, node: FunctionDef, env: Environment):
     """Evaluate decorated function."""
-    func = self.eval(node.func, env)
+    func = SharpFunction(node.name, node.params, node.defaults, node.body, env)
     
     # Apply decorators from bottom to top
     for decorator in reversed(node.decorators):
@@ -155,7 +155,7 @@ def eval_yield_stmt(self, node: YieldStmt, env: Environment):
         return self.eval(node.value, env)
     return None
 
-def eval_async_function_def(self, node: AsyncFunctionDef, env: Environment):
+def eval_async_function_def(self, node: FunctionDef, env: Environment):
     """Evaluate async function definition."""
     # For now, treat async functions like regular functions
     # Full async support would require asyncio integration
@@ -6,7 +6,8 @@ Tokenizes Sharp source code into a stream of tokens.
 import re
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from functools import lru_cache
+from typing import Iterator, List, Optional, Any, Tuple
 
 class TokenType(Enum):
     # Literals
@@ -300,10 +301,16 @@ class Lexer:
         return Token(token_type, value, start_line, start_column)
 
     def tokenize(self) -> List[Token]:
-        """Tokenize the source code."""
+        """Tokenize the source code into a list."""
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """Yield tokens one at a time without accumulating them."""
         # First pass: tokenize without indentation tracking
         lines = self.source.split('\n')
         indent_stack = [0]
+        last = None  # Last token yielded
         
         for line_num, line in enumerate(lines, 1):
             # Count leading spaces
@@ -321,227 +328,243 @@ class Lexer:
             # Process indentation
             if indent > indent_stack[-1]:
                 indent_stack.append(indent)
-                self.tokens.append(Token(TokenType.INDENT, None, line_num, indent + 1))
+                last = Token(TokenType.INDENT, None, line_num, indent + 1)
+                yield last
             elif indent < indent_stack[-1]:
                 while indent_stack and indent < indent_stack[-1]:
                     indent_stack.pop()
-                    self.tokens.append(Token(TokenType.DEDENT, None, line_num, 1))
+                    last = Token(TokenType.DEDENT, None, line_num, 1)
+                    yield last
             
             # Tokenize line content
-            pos = 0
-            while pos < len(line):
-                # Skip whitespace
-                while pos < len(line) and line[pos] in ' \t':
-                    pos += 1
-                
-                if pos >= len(line):
-                    break
-                
-                # Comment
-                if line[pos] == '#':
-                    break
-                
-                # String
-                if line[pos] in '"\'':
-                    quote = line[pos]
-                    pos += 1
-                    start_pos = pos
-                    string_val = ""
-                    while pos < len(line):
-                        if line[pos] == '\\':
-                            pos += 1
-                            if pos < len(line):
-                                escape_char = line[pos]
-                                if escape_char == 'n':
-                                    string_val += '\n'
-                                elif escape_char == 't':
-                                    string_val += '\t'
-                                elif escape_char == '\\':
-                                    string_val += '\\'
-                                elif escape_char == quote:
-                                    string_val += quote
-                                else:
-                                    string_val += escape_char
-                                pos += 1
-                        elif line[pos] == quote:
-                            pos += 1
-                            break
-                        else:
-                            string_val += line[pos]
-                            pos += 1
-                    self.tokens.append(Token(TokenType.STRING, string_val, line_num, start_pos))
-                    continue
-                
-                # Number
-                if line[pos].isdigit():
-                    start_pos = pos
-                    num_str = ""
-                    while pos < len(line) and (line[pos].isdigit() or line[pos] == '.'):
-                        num_str += line[pos]
-                        pos += 1
-                    if '.' in num_str:
-                        self.tokens.append(Token(TokenType.FLOAT, float(num_str), line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.INTEGER, int(num_str), line_num, start_pos))
-                    continue
-                
-                # Identifier or keyword
-                if line[pos].isalpha() or line[pos] == '_':
-                    start_pos = pos
-                    ident = ""
-                    while pos < len(line) and (line[pos].isalnum() or line[pos] == '_'):
-                        ident += line[pos]
-                        pos += 1
-                    
-                    if ident in self.KEYWORDS:
-                        token_type = self.KEYWORDS[ident]
-                        if token_type == TokenType.TRUE:
-                            self.tokens.append(Token(token_type, True, line_num, start_pos))
-                        elif token_type == TokenType.FALSE:
-                            self.tokens.append(Token(token_type, False, line_num, start_pos))
-                        elif token_type == TokenType.NIL:
-                            self.tokens.append(Token(token_type, None, line_num, start_pos))
-                        else:
-                            self.tokens.append(Token(token_type, ident, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.IDENTIFIER, ident, line_num, start_pos))
-                    continue
-                
-                # Operators and delimiters
+            for token in self._line_tokens(line, line_num):
+                yield token
+                last = token
+            
+            # Add newline after line (if not last line)
+            if line_num < len(lines) and last is not None and last.type not in (TokenType.NEWLINE, TokenType.INDENT, TokenType.DEDENT):
+                last = Token(TokenType.NEWLINE, None, line_num, len(line))
+                yield last
+        
+        # Add final dedents
+        while len(indent_stack) > 1:
+            indent_stack.pop()
+            yield Token(TokenType.DEDENT, None, len(lines), 1)
+        
+        yield Token(TokenType.EOF, None, len(lines), 1)
+
+    def _line_tokens(self, line: str, line_num: int) -> Iterator[Token]:
+        """Yield the tokens of one source line (no indentation tokens)."""
+        pos = 0
+        while pos < len(line):
+            # Skip whitespace
+            while pos < len(line) and line[pos] in ' \t':
+                pos += 1
+            
+            if pos >= len(line):
+                break
+            
+            # Comment
+            if line[pos] == '#':
+                break
+            
+            # String
+            if line[pos] in '"\'':
+                quote = line[pos]
+                pos += 1
                 start_pos = pos
-                ch = line[pos]
-                
-                if ch == '+':
-                    pos += 1
-                    if pos < len(line) and line[pos] == '=':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.PLUS_ASSIGN, None, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.PLUS, None, line_num, start_pos))
-                elif ch == '-':
-                    pos += 1
-                    if pos < len(line) and line[pos] == '=':
+                string_val = ""
+                while pos < len(line):
+                    if line[pos] == '\\':
                         pos += 1
-                        self.tokens.append(Token(TokenType.MINUS_ASSIGN, None, line_num, start_pos))
-                    elif pos < len(line) and line[pos] == '>':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.ARROW, None, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.MINUS, None, line_num, start_pos))
-                elif ch == '*':
-                    pos += 1
-                    if pos < len(line) and line[pos] == '*':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.POWER, None, line_num, start_pos))
-                    elif pos < len(line) and line[pos] == '=':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.STAR_ASSIGN, None, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.STAR, None, line_num, start_pos))
-                elif ch == '/':
-                    pos += 1
-                    if pos < len(line) and line[pos] == '=':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.SLASH_ASSIGN, None, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.SLASH, None, line_num, start_pos))
-                elif ch == '%':
-                    pos += 1
-                    self.tokens.append(Token(TokenType.PERCENT, None, line_num, start_pos))
-                elif ch == '=':
-                    pos += 1
-                    if pos < len(line) and line[pos] == '=':
+                        if pos < len(line):
+                            escape_char = line[pos]
+                            if escape_char == 'n':
+                                string_val += '\n'
+                            elif escape_char == 't':
+                                string_val += '\t'
+                            elif escape_char == '\\':
+                                string_val += '\\'
+                            elif escape_char == quote:
+                                string_val += quote
+                            else:
+                                string_val += escape_char
+                            pos += 1
+                    elif line[pos] == quote:
                         pos += 1
-                        self.tokens.append(Token(TokenType.EQ, None, line_num, start_pos))
+                        break
                     else:
-                        self.tokens.append(Token(TokenType.ASSIGN, None, line_num, start_pos))
-                elif ch == '!':
-                    pos += 1
-                    if pos < len(line) and line[pos] == '=':
+                        string_val += line[pos]
                         pos += 1
-                        self.tokens.append(Token(TokenType.NE, None, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.NOT, None, line_num, start_pos))
-                elif ch == '<':
+                yield Token(TokenType.STRING, string_val, line_num, start_pos)
+                continue
+            
+            # Number
+            if line[pos].isdigit():
+                start_pos = pos
+                num_str = ""
+                while pos < len(line) and (line[pos].isdigit() or line[pos] == '.'):
+                    num_str += line[pos]
                     pos += 1
-                    if pos < len(line) and line[pos] == '=':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.LE, None, line_num, start_pos))
-                    elif pos < len(line) and line[pos] == '<':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.LSHIFT, None, line_num, start_pos))
-                    else:
-                        self.tokens.append(Token(TokenType.LT, None, line_num, start_pos))
-                elif ch == '>':
+                if '.' in num_str:
+                    yield Token(TokenType.FLOAT, float(num_str), line_num, start_pos)
+                else:
+                    yield Token(TokenType.INTEGER, int(num_str), line_num, start_pos)
+                continue
+            
+            # Identifier or keyword
+            if line[pos].isalpha() or line[pos] == '_':
+                start_pos = pos
+                ident = ""
+                while pos < len(line) and (line[pos].isalnum() or line[pos] == '_'):
+                    ident += line[pos]
                     pos += 1
-                    if pos < len(line) and line[pos] == '=':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.GE, None, line_num, start_pos))
-                    elif pos < len(line) and line[pos] == '>':
-                        pos += 1
-                        self.tokens.append(Token(TokenType.RSHIFT, None, line_num, start_pos))
+                
+                if ident in self.KEYWORDS:
+                    token_type = self.KEYWORDS[ident]
+                    if token_type == TokenType.TRUE:
+                        yield Token(token_type, True, line_num, start_pos)
+                    elif token_type == TokenType.FALSE:
+                        yield Token(token_type, False, line_num, start_pos)
+                    elif token_type == TokenType.NIL:
+                        yield Token(token_type, None, line_num, start_pos)
                     else:
-                        self.tokens.append(Token(TokenType.GT, None, line_num, start_pos))
-                elif ch == '(':
-                    pos += 1
-                    self.tokens.append(Token(TokenType.LPAREN, None, line_num, start_pos))
-                elif ch == ')':
-                    pos += 1
-                    self.tokens.append(Token(TokenType.RPAREN, None, line_num, start_pos))
-                elif ch == '[':
-                    pos += 1
-                    self.tokens.append(Token(TokenType.LBRACKET, None, line_num, start_pos))
-                elif ch == ']':
-                    pos += 1
-                    self.tokens.append(Token(TokenType.RBRACKET, None, line_num, start_pos))
-                elif ch == '{':
+                        yield Token(token_type, ident, line_num, start_pos)
+                else:
+                    yield Token(TokenType.IDENTIFIER, ident, line_num, start_pos)
+                continue
+            
+            # Operators and delimiters
+            start_pos = pos
+            ch = line[pos]
+            
+            if ch == '+':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.LBRACE, None, line_num, start_pos))
-                elif ch == '}':
+                    yield Token(TokenType.PLUS_ASSIGN, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.PLUS, None, line_num, start_pos)
+            elif ch == '-':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.RBRACE, None, line_num, start_pos))
-                elif ch == ',':
+                    yield Token(TokenType.MINUS_ASSIGN, None, line_num, start_pos)
+                elif pos < len(line) and line[pos] == '>':
                     pos += 1
-                    self.tokens.append(Token(TokenType.COMMA, None, line_num, start_pos))
-                elif ch == '.':
+                    yield Token(TokenType.ARROW, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.MINUS, None, line_num, start_pos)
+            elif ch == '*':
+                pos += 1
+                if pos < len(line) and line[pos] == '*':
                     pos += 1
-                    self.tokens.append(Token(TokenType.DOT, None, line_num, start_pos))
-                elif ch == ':':
+                    yield Token(TokenType.POWER, None, line_num, start_pos)
+                elif pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.COLON, None, line_num, start_pos))
-                elif ch == ';':
+                    yield Token(TokenType.STAR_ASSIGN, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.STAR, None, line_num, start_pos)
+            elif ch == '/':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.SEMICOLON, None, line_num, start_pos))
-                elif ch == '|':
+                    yield Token(TokenType.SLASH_ASSIGN, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.SLASH, None, line_num, start_pos)
+            elif ch == '%':
+                pos += 1
+                yield Token(TokenType.PERCENT, None, line_num, start_pos)
+            elif ch == '=':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.PIPE, None, line_num, start_pos))
-                elif ch == '&':
+                    yield Token(TokenType.EQ, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.ASSIGN, None, line_num, start_pos)
+            elif ch == '!':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.BIT_AND, None, line_num, start_pos))
-                elif ch == '^':
+                    yield Token(TokenType.NE, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.NOT, None, line_num, start_pos)
+            elif ch == '<':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.BIT_XOR, None, line_num, start_pos))
-                elif ch == '~':
+                    yield Token(TokenType.LE, None, line_num, start_pos)
+                elif pos < len(line) and line[pos] == '<':
                     pos += 1
-                    self.tokens.append(Token(TokenType.BIT_NOT, None, line_num, start_pos))
-                elif ch == '?':
+                    yield Token(TokenType.LSHIFT, None, line_num, start_pos)
+                else:
+                    yield Token(TokenType.LT, None, line_num, start_pos)
+            elif ch == '>':
+                pos += 1
+                if pos < len(line) and line[pos] == '=':
                     pos += 1
-                    self.tokens.append(Token(TokenType.QUESTION, None, line_num, start_pos))
-                elif ch == '@':
+                    yield Token(TokenType.GE, None, line_num, start_pos)
+                elif pos < len(line) and line[pos] == '>':
                     pos += 1
-                    self.tokens.append(Token(TokenType.AT, None, line_num, start_pos))
+                    yield Token(TokenType.RSHIFT, None, line_num, start_pos)
                 else:
-                    self.error(f"Unexpected character '{ch}' at line {line_num}")
-                    pos += 1
-            
-            # Add newline after line (if not last line)
-            if line_num < len(lines) and self.tokens and self.tokens[-1].type not in (TokenType.NEWLINE, TokenType.INDENT, TokenType.DEDENT):
-                self.tokens.append(Token(TokenType.NEWLINE, None, line_num, len(line)))
-        
-        # Add final dedents
-        while len(indent_stack) > 1:
-            indent_stack.pop()
-            self.tokens.append(Token(TokenType.DEDENT, None, len(lines), 1))
-        
-        self.tokens.append(Token(TokenType.EOF, None, len(lines), 1))
-        return self.tokens
+                    yield Token(TokenType.GT, None, line_num, start_pos)
+            elif ch == '(':
+                pos += 1
+                yield Token(TokenType.LPAREN, None, line_num, start_pos)
+            elif ch == ')':
+                pos += 1
+                yield Token(TokenType.RPAREN, None, line_num, start_pos)
+            elif ch == '[':
+                pos += 1
+                yield Token(TokenType.LBRACKET, None, line_num, start_pos)
+            elif ch == ']':
+                pos += 1
+                yield Token(TokenType.RBRACKET, None, line_num, start_pos)
+            elif ch == '{':
+                pos += 1
+                yield Token(TokenType.LBRACE, None, line_num, start_pos)
+            elif ch == '}':
+                pos += 1
+                yield Token(TokenType.RBRACE, None, line_num, start_pos)
+            elif ch == ',':
+                pos += 1
+                yield Token(TokenType.COMMA, None, line_num, start_pos)
+            elif ch == '.':
+                pos += 1
+                yield Token(TokenType.DOT, None, line_num, start_pos)
+            elif ch == ':':
+                pos += 1
+                yield Token(TokenType.COLON, None, line_num, start_pos)
+            elif ch == ';':
+                pos += 1
+                yield Token(TokenType.SEMICOLON, None, line_num, start_pos)
+            elif ch == '|':
+                pos += 1
+                yield Token(TokenType.PIPE, None, line_num, start_pos)
+            elif ch == '&':
+                pos += 1
+                yield Token(TokenType.BIT_AND, None, line_num, start_pos)
+            elif ch == '^':
+                pos += 1
+                yield Token(TokenType.BIT_XOR, None, line_num, start_pos)
+            elif ch == '~':
+                pos += 1
+                yield Token(TokenType.BIT_NOT, None, line_num, start_pos)
+            elif ch == '?':
+                pos += 1
+                yield Token(TokenType.QUESTION, None, line_num, start_pos)
+            elif ch == '@':
+                pos += 1
+                yield Token(TokenType.AT, None, line_num, start_pos)
+            else:
+                yield Token(TokenType.ERROR, f"Unexpected character '{ch}' at line {line_num}", self.line, self.column)
+                pos += 1
+
+@lru_cache(maxsize=64)
+def tokenize_cached(source: str) -> Tuple[Token, ...]:
+    """Tokenize ``source``, reusing the result for repeated identical sources.
+
+    The tokens are shared between callers, so treat them as read-only.
+    """
+    return tuple(Lexer(source).iter_tokens())
@@ -3,10 +3,34 @@ Enhanced Parser for Sharp Programming Language.
 Supports multi-line dictionaries, lists, 'in' operator, and more.
 """
 
-from typing import List, Optional, Any
-from lexer import Token, TokenType
+from functools import lru_cache
+from typing import List, Optional, Tuple, Any
+from lexer import Token, TokenType, tokenize_cached
 from ast_nodes import *
 
+# Token type -> Operator for each precedence level
+COMPARISON_OPS = {
+    TokenType.EQ: Operator.EQ,
+    TokenType.NE: Operator.NE,
+    TokenType.LT: Operator.LT,
+    TokenType.LE: Operator.LE,
+    TokenType.GT: Operator.GT,
+    TokenType.GE: Operator.GE,
+    TokenType.IN: Operator.IN,
+}
+SHIFT_OPS = {TokenType.LSHIFT: Operator.LSHIFT, TokenType.RSHIFT: Operator.RSHIFT}
+ADDITIVE_OPS = {TokenType.PLUS: Operator.ADD, TokenType.MINUS: Operator.SUB}
+MULTIPLICATIVE_OPS = {
+    TokenType.STAR: Operator.MUL,
+    TokenType.SLASH: Operator.DIV,
+    TokenType.PERCENT: Operator.MOD,
+}
+UNARY_OPS = {
+    TokenType.PLUS: Operator.POS,
+    TokenType.MINUS: Operator.NEG,
+    TokenType.BIT_NOT: Operator.INVERT,
+}
+
 class Parser:
     """Enhanced parser for Sharp with better syntax support."""
 
@@ -15,6 +39,7 @@ class Parser:
         self.position = 0
         self.current_token = self.tokens[0] if tokens else None
         self.paren_depth = 0  # Track nesting level for multi-line support
+        self.nodes = NodeBuilder()  # Shares identical expression subtrees
 
     def error(self, message: str):
         """Raise a syntax error with location info."""
@@ -84,7 +109,7 @@ class Parser:
                 statements.append(stmt)
             self.skip_newlines()
         
-        return Program(statements)
+        return Program(tuple(statements))
 
     def parse_statement(self) -> Optional[ASTNode]:
         """Parse a single statement."""
@@ -171,14 +196,14 @@ class Parser:
         
         return FunctionDef(name_token.value, params, defaults, body)
 
-    def parse_variable(self) -> VarDecl:
+    def parse_variable(self) -> Assignment:
         """Parse variable declaration."""
         self.expect(TokenType.LET)
         name_token = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.ASSIGN)
         value = self.parse_expression()
         
-        return VarDecl(name_token.value, value)
+        return Assignment(AssignKind.DECLARE, (name_token.value,), value)
 
     def parse_if(self) -> IfExpr:
         """Parse if expression."""
@@ -197,7 +222,7 @@ class Parser:
             self.expect(TokenType.COLON)
             self.skip_newlines()
             elif_body = self.parse_block()
-            elif_parts.append((elif_cond, elif_body))
+            elif_parts.append(ElifPart(elif_cond, elif_body))
         
         if self.current_token and self.current_token.type == TokenType.ELSE:
             self.advance()
@@ -246,7 +271,7 @@ class Parser:
             self.expect(TokenType.COLON)
             self.skip_newlines()
             body = self.parse_block()
-            cases.append((pattern, body))
+            cases.append(MatchCase(pattern, body))
         
         self.expect(TokenType.DEDENT)
         
@@ -262,8 +287,9 @@ class Parser:
         value = self.parse_expression()
         return ReturnStmt(value)
 
-    def parse_type_def(self) -> TypeDef:
+    def parse_type_def(self) -> 'TypeDef':
         """Parse type definition."""
+        from ast_nodes import TypeDef, TypeVariant
         self.expect(TokenType.TYPE)
         name_token = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.COLON)
@@ -289,7 +315,7 @@ class Parser:
                         self.advance()
                 self.expect(TokenType.RPAREN)
             
-            variants.append((variant_token.value, fields))
+            variants.append(TypeVariant(variant_token.value, fields))
             self.skip_newlines()
         
         self.expect(TokenType.DEDENT)
@@ -326,7 +352,7 @@ class Parser:
                 alias_token = self.expect(TokenType.IDENTIFIER)
                 alias = alias_token.value
             
-            items.append((item_name, alias))
+            items.append(ImportItem(item_name, alias))
             
             if self.current_token and self.current_token.type == TokenType.COMMA:
                 self.advance()
@@ -335,7 +361,7 @@ class Parser:
         
         return FromImportStmt(module_token.value, items)
 
-    def parse_block(self) -> List[ASTNode]:
+    def parse_block(self) -> Tuple[ASTNode, ...]:
         """Parse a block of statements."""
         statements = []
         self.expect(TokenType.INDENT)
@@ -349,7 +375,7 @@ class Parser:
                 statements.append(stmt)
         
         self.expect(TokenType.DEDENT)
-        return statements
+        return tuple(statements)
 
     def parse_expression_statement(self) -> ASTNode:
         """Parse expression statement (may include assignment)."""
@@ -359,7 +385,7 @@ class Parser:
             if isinstance(expr, Identifier):
                 self.advance()
                 value = self.parse_expression()
-                return Assignment(expr.name, value)
+                return Assignment(AssignKind.ASSIGN, (expr.name,), value)
         
         return expr
 
@@ -374,7 +400,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.OR:
             self.advance()
             right = self.parse_and()
-            left = BinaryOp(left, 'or', right)
+            left = self.nodes.binary_op(left, Operator.OR, right)
         
         return left
 
@@ -385,7 +411,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.AND:
             self.advance()
             right = self.parse_not()
-            left = BinaryOp(left, 'and', right)
+            left = self.nodes.binary_op(left, Operator.AND, right)
         
         return left
 
@@ -394,7 +420,7 @@ class Parser:
         if self.current_token and self.current_token.type == TokenType.NOT:
             self.advance()
             operand = self.parse_not()
-            return UnaryOp('not', operand)
+            return self.nodes.unary_op(Operator.NOT, operand)
         
         return self.parse_comparison()
 
@@ -402,24 +428,11 @@ class Parser:
         """Parse comparison (including 'in' operator)."""
         left = self.parse_bitwise_or()
         
-        while self.current_token and self.current_token.type in (
-            TokenType.EQ, TokenType.NE, TokenType.LT, TokenType.LE,
-            TokenType.GT, TokenType.GE, TokenType.IN
-        ):
-            op_token = self.current_token
-            op_map = {
-                TokenType.EQ: '==',
-                TokenType.NE: '!=',
-                TokenType.LT: '<',
-                TokenType.LE: '<=',
-                TokenType.GT: '>',
-                TokenType.GE: '>=',
-                TokenType.IN: 'in',
-            }
-            op = op_map[op_token.type]
+        while self.current_token and self.current_token.type in COMPARISON_OPS:
+            op = COMPARISON_OPS[self.current_token.type]
             self.advance()
             right = self.parse_bitwise_or()
-            left = BinaryOp(left, op, right)
+            left = self.nodes.binary_op(left, op, right)
         
         return left
 
@@ -430,7 +443,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.PIPE:
             self.advance()
             right = self.parse_bitwise_xor()
-            left = BinaryOp(left, '|', right)
+            left = self.nodes.binary_op(left, Operator.BIT_OR, right)
         
         return left
 
@@ -441,7 +454,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.BIT_XOR:
             self.advance()
             right = self.parse_bitwise_and()
-            left = BinaryOp(left, '^', right)
+            left = self.nodes.binary_op(left, Operator.BIT_XOR, right)
         
         return left
 
@@ -452,7 +465,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.BIT_AND:
             self.advance()
             right = self.parse_shift()
-            left = BinaryOp(left, '&', right)
+            left = self.nodes.binary_op(left, Operator.BIT_AND, right)
         
         return left
 
@@ -460,11 +473,11 @@ class Parser:
         """Parse shift operators."""
         left = self.parse_additive()
         
-        while self.current_token and self.current_token.type in (TokenType.LSHIFT, TokenType.RSHIFT):
-            op = '<<' if self.current_token.type == TokenType.LSHIFT else '>>'
+        while self.current_token and self.current_token.type in SHIFT_OPS:
+            op = SHIFT_OPS[self.current_token.type]
             self.advance()
             right = self.parse_additive()
-            left = BinaryOp(left, op, right)
+            left = self.nodes.binary_op(left, op, right)
         
         return left
 
@@ -472,11 +485,11 @@ class Parser:
         """Parse addition and subtraction."""
         left = self.parse_multiplicative()
         
-        while self.current_token and self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            op = '+' if self.current_token.type == TokenType.PLUS else '-'
+        while self.current_token and self.current_token.type in ADDITIVE_OPS:
+            op = ADDITIVE_OPS[self.current_token.type]
             self.advance()
             right = self.parse_multiplicative()
-            left = BinaryOp(left, op, right)
+            left = self.nodes.binary_op(left, op, right)
         
         return left
 
@@ -484,16 +497,11 @@ class Parser:
         """Parse multiplication, division, modulo."""
         left = self.parse_power()
         
-        while self.current_token and self.current_token.type in (TokenType.STAR, TokenType.SLASH, TokenType.PERCENT):
-            op_token = self.current_token
-            op = {
-                TokenType.STAR: '*',
-                TokenType.SLASH: '/',
-                TokenType.PERCENT: '%',
-            }[op_token.type]
+        while self.current_token and self.current_token.type in MULTIPLICATIVE_OPS:
+            op = MULTIPLICATIVE_OPS[self.current_token.type]
             self.advance()
             right = self.parse_power()
-            left = BinaryOp(left, op, right)
+            left = self.nodes.binary_op(left, op, right)
         
         return left
 
@@ -504,22 +512,17 @@ class Parser:
         if self.current_token and self.current_token.type == TokenType.POWER:
             self.advance()
             right = self.parse_power()
-            return BinaryOp(left, '**', right)
+            return self.nodes.binary_op(left, Operator.POW, right)
         
         return left
 
     def parse_unary(self) -> ASTNode:
         """Parse unary operators."""
-        if self.current_token and self.current_token.type in (TokenType.PLUS, TokenType.MINUS, TokenType.BIT_NOT):
-            op_token = self.current_token
-            op = {
-                TokenType.PLUS: '+',
-                TokenType.MINUS: '-',
-                TokenType.BIT_NOT: '~',
-            }[op_token.type]
+        if self.current_token and self.current_token.type in UNARY_OPS:
+            op = UNARY_OPS[self.current_token.type]
             self.advance()
             operand = self.parse_unary()
-            return UnaryOp(op, operand)
+            return self.nodes.unary_op(op, operand)
         
         return self.parse_postfix()
 
@@ -575,22 +578,24 @@ class Parser:
                     else:
                         # Regular index
                         self.expect(TokenType.RBRACKET)
-                        expr = IndexAccess(expr, first_expr)
+                        expr = self.nodes.index(expr, first_expr)
             elif self.current_token and self.current_token.type == TokenType.DOT:
                 self.advance()
                 attr_token = self.expect(TokenType.IDENTIFIER)
-                expr = AttributeAccess(expr, attr_token.value)
+                expr = self.nodes.attribute(expr, attr_token.value)
             elif self.current_token and self.current_token.type == TokenType.LPAREN:
                 self.advance()
                 args = []
-                kwargs = {}
+                kw_names = []
+                kw_values = []
                 
                 while self.current_token and self.current_token.type != TokenType.RPAREN:
                     arg = self.parse_expression()
                     
                     if self.current_token and self.current_token.type == TokenType.ASSIGN and isinstance(arg, Identifier):
                         self.advance()
-                        kwargs[arg.name] = self.parse_expression()
+                        kw_names.append(arg.name)
+                        kw_values.append(self.parse_expression())
                     else:
                         args.append(arg)
                     
@@ -599,7 +604,10 @@ class Parser:
                         self.skip_newlines_preserve_indentation()
                 
                 self.expect(TokenType.RPAREN)
-                expr = FunctionCall(expr, args, kwargs)
+                if kw_names:
+                    expr = FunctionCall(expr, args, tuple(kw_names), tuple(kw_values))
+                else:
+                    expr = FunctionCall(expr, args)
             else:
                 break
         
@@ -614,34 +622,34 @@ class Parser:
         if self.current_token.type == TokenType.INTEGER:
             value = int(self.current_token.value)
             self.advance()
-            return IntLiteral(value)
+            return self.nodes.int_lit(value)
         
         elif self.current_token.type == TokenType.FLOAT:
             value = float(self.current_token.value)
             self.advance()
-            return FloatLiteral(value)
+            return self.nodes.float_lit(value)
         
         elif self.current_token.type == TokenType.STRING:
             value = self.current_token.value
             self.advance()
-            return StringLiteral(value)
+            return self.nodes.string_lit(value)
         
         elif self.current_token.type == TokenType.TRUE:
             self.advance()
-            return BoolLiteral(True)
+            return self.nodes.bool_lit(True)
         
         elif self.current_token.type == TokenType.FALSE:
             self.advance()
-            return BoolLiteral(False)
+            return self.nodes.bool_lit(False)
         
         elif self.current_token.type == TokenType.NIL:
             self.advance()
-            return NilLiteral()
+            return self.nodes.nil_lit()
         
         elif self.current_token.type == TokenType.IDENTIFIER:
             name = self.current_token.value
             self.advance()
-            return Identifier(name)
+            return self.nodes.identifier(name)
         
         elif self.current_token.type == TokenType.LPAREN:
             self.advance()
@@ -761,7 +769,7 @@ class Parser:
             self.skip_newlines_preserve_indentation()
             first_value = self.parse_expression()
             
-            pairs = [(first_key, first_value)]
+            pairs = [DictPair(first_key, first_value)]
             
             while self.current_token and self.current_token.type == TokenType.COMMA:
                 self.advance()
@@ -774,7 +782,7 @@ class Parser:
                 self.expect(TokenType.COLON)
                 self.skip_newlines_preserve_indentation()
                 value = self.parse_expression()
-                pairs.append((key, value))
+                pairs.append(DictPair(key, value))
                 self.skip_newlines_preserve_indentation()
             
             self.skip_newlines_preserve_indentation()
@@ -842,33 +850,9 @@ class Parser:
         self.expect(TokenType.ASYNC)
         
         if self.current_token and self.current_token.type == TokenType.DEF:
-            self.advance()
-            name_token = self.expect(TokenType.IDENTIFIER)
-            self.expect(TokenType.LPAREN)
-            
-            params = []
-            defaults = []
-            
-            while self.current_token and self.current_token.type != TokenType.RPAREN:
-                param_token = self.expect(TokenType.IDENTIFIER)
-                params.append(param_token.value)
-                
-                if self.current_token and self.current_token.type == TokenType.ASSIGN:
-                    self.advance()
-                    defaults.append(self.parse_expression())
-                else:
-                    defaults.append(None)
-                
-                if self.current_token and self.current_token.type == TokenType.COMMA:
-                    self.advance()
-            
-            self.expect(TokenType.RPAREN)
-            self.expect(TokenType.COLON)
-            self.skip_newlines()
-            
-            body = self.parse_block()
-            
-            return AsyncFunctionDef(name_token.value, params, defaults, body)
+            func = self.parse_function()
+            func.is_async = True
+            return func
         
         elif self.current_token and self.current_token.type == TokenType.FOR:
             return self.parse_async_for()
@@ -879,8 +863,9 @@ class Parser:
         else:
             self.error("Expected 'def', 'for', or 'with' after 'async'")
 
-    def parse_async_for(self) -> AsyncForLoop:
+    def parse_async_for(self) -> 'AsyncForLoop':
         """Parse async for loop."""
+        from ast_nodes import AsyncForLoop
         self.expect(TokenType.FOR)
         target_token = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.IN)
@@ -892,8 +877,9 @@ class Parser:
         
         return AsyncForLoop(target_token.value, iterable, body)
 
-    def parse_async_with(self) -> AsyncWithStmt:
+    def parse_async_with(self) -> 'AsyncWithStmt':
         """Parse async with statement."""
+        from ast_nodes import AsyncWithStmt
         self.expect(TokenType.WITH)
         context_expr = self.parse_expression()
         
@@ -1034,6 +1020,7 @@ class Parser:
 
     def parse_decorator(self) -> ASTNode:
         """Parse decorator and the decorated function/class."""
+        from ast_nodes import Decorator, DecoratedClass
         decorators = []
         
         # Parse all decorators
@@ -1056,10 +1043,19 @@ class Parser:
         # Parse decorated function or class
         if self.current_token and self.current_token.type == TokenType.DEF:
             func = self.parse_function()
-            return DecoratedFunction(decorators, func)
+            func.decorators = tuple(decorators)
+            return func
         elif self.current_token and self.current_token.type == TokenType.CLASS:
             cls = self.parse_class()
             return DecoratedClass(decorators, cls)
         else:
             self.error("Decorator must precede a function or class definition")
 
+
+@lru_cache(maxsize=32)
+def parse_cached(source: str) -> Program:
+    """Parse ``source``, reusing the tree for repeated identical sources.
+
+    The tree is shared between callers, so treat it as read-only.
+    """
+    return Parser(tokenize_cached(source)).parse()
@@ -11,9 +11,9 @@
 
 from lexer import TokenType
 from ast_nodes import (
-    ClassDef, DecoratedFunction, DecoratedClass, Decorator,
+    ClassDef, FunctionDef, DecoratedClass, Decorator,
     TryStmt, ExceptHandler, RaiseStmt, WithStmt, YieldStmt,
-    AsyncFunctionDef, AsyncForLoop, AsyncWithStmt,
+    AsyncForLoop, AsyncWithStmt,
     ASTNode
 )
 
@@ -69,7 +69,7 @@ def parse_async(self) -> ASTNode:
         
         body = self.parse_block()
         
-        return AsyncFunctionDef(name_token.value, params, defaults, body)
+        return FunctionDef(name_token.value, params, defaults, body, is_async=True)
     
     elif self.current_token and self.current_token.type == TokenType.FOR:
         return self.parse_async_for()
@@ -227,7 +227,8 @@ def parse_decorator(self) -> ASTNode:
     # Parse decorated function or class
     if self.current_token and self.current_token.type == TokenType.DEF:
         func = self.parse_function()
-        return DecoratedFunction(decorators, func)
+        func.decorators = tuple(decorators)
+        return func
     elif self.current_token and self.current_token.type == TokenType.CLASS:
         cls = self.parse_class()
         return DecoratedClass(decorators, cls)
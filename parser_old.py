@@ -7,6 +7,14 @@ from typing import List, Optional, Any
 from lexer import Token, TokenType
 from ast_nodes import *
 
+# Token type -> Operator for augmented assignment
+AUGMENTED_OPS = {
+    TokenType.PLUS_ASSIGN: Operator.ADD,
+    TokenType.MINUS_ASSIGN: Operator.SUB,
+    TokenType.STAR_ASSIGN: Operator.MUL,
+    TokenType.SLASH_ASSIGN: Operator.DIV,
+}
+
 class Parser:
     """Parses Sharp tokens into an AST."""
 
@@ -146,14 +154,14 @@ class Parser:
         
         return params, defaults
 
-    def parse_var_decl(self) -> VarDecl:
+    def parse_var_decl(self) -> Assignment:
         """Parse variable declaration."""
         self.expect(TokenType.LET)
         name_token = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.ASSIGN)
         value = self.parse_expression()
         
-        return VarDecl(name_token.value, value)
+        return Assignment(AssignKind.DECLARE, (name_token.value,), value)
 
     def parse_if(self) -> IfExpr:
         """Parse if expression."""
@@ -239,8 +247,9 @@ class Parser:
         value = self.parse_expression()
         return ReturnStmt(value)
 
-    def parse_type_def(self) -> TypeDef:
+    def parse_type_def(self) -> 'TypeDef':
         """Parse type definition."""
+        from ast_nodes import TypeDef
         self.expect(TokenType.TYPE)
         name_token = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.COLON)
@@ -336,14 +345,13 @@ class Parser:
             if isinstance(expr, Identifier):
                 self.advance()
                 value = self.parse_expression()
-                return Assignment(expr.name, value)
+                return Assignment(AssignKind.ASSIGN, (expr.name,), value)
         elif self.current_token and self.current_token.type in (TokenType.PLUS_ASSIGN, TokenType.MINUS_ASSIGN, TokenType.STAR_ASSIGN, TokenType.SLASH_ASSIGN):
             if isinstance(expr, Identifier):
-                op_token = self.current_token
-                op = op_token.value or op_token.type.name.replace('_ASSIGN', '').lower()
+                op = AUGMENTED_OPS[self.current_token.type]
                 self.advance()
                 value = self.parse_expression()
-                return AugmentedAssignment(expr.name, op, value)
+                return Assignment(AssignKind.AUGMENTED, (expr.name,), value, op)
         
         return expr
 
@@ -359,7 +367,7 @@ class Parser:
             op_token = self.current_token
             self.advance()
             right = self.parse_and_expr()
-            left = BinaryOp(left, 'or', right)
+            left = BinaryOp(left, Operator.OR, right)
         
         return left
     
@@ -371,7 +379,7 @@ class Parser:
             op_token = self.current_token
             self.advance()
             right = self.parse_not_expr()
-            left = BinaryOp(left, 'and', right)
+            left = BinaryOp(left, Operator.AND, right)
         
         return left
     
@@ -380,7 +388,7 @@ class Parser:
         if self.current_token and self.current_token.type == TokenType.NOT:
             self.advance()
             expr = self.parse_not_expr()
-            return UnaryOp('not', expr)
+            return UnaryOp(Operator.NOT, expr)
         
         return self.parse_comparison()
     
@@ -394,19 +402,19 @@ class Parser:
         ):
             op_token = self.current_token
             if op_token.type == TokenType.EQ:
-                op = '=='
+                op = Operator.EQ
             elif op_token.type == TokenType.NE:
-                op = '!='
+                op = Operator.NE
             elif op_token.type == TokenType.LT:
-                op = '<'
+                op = Operator.LT
             elif op_token.type == TokenType.LE:
-                op = '<='
+                op = Operator.LE
             elif op_token.type == TokenType.GT:
-                op = '>'
+                op = Operator.GT
             elif op_token.type == TokenType.GE:
-                op = '>='
+                op = Operator.GE
             elif op_token.type == TokenType.IN:
-                op = 'in'
+                op = Operator.IN
             
             self.advance()
             right = self.parse_bitwise_or()
@@ -423,7 +431,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.OR:
             self.advance()
             right = self.parse_and()
-            left = BinaryOp(left, 'or', right)
+            left = BinaryOp(left, Operator.OR, right)
         
         return left
 
@@ -434,7 +442,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.AND:
             self.advance()
             right = self.parse_not()
-            left = BinaryOp(left, 'and', right)
+            left = BinaryOp(left, Operator.AND, right)
         
         return left
 
@@ -443,7 +451,7 @@ class Parser:
         if self.current_token and self.current_token.type == TokenType.NOT:
             self.advance()
             operand = self.parse_not()
-            return UnaryOp('not', operand)
+            return UnaryOp(Operator.NOT, operand)
         
         return self.parse_comparison()
 
@@ -454,12 +462,12 @@ class Parser:
         while self.current_token and self.current_token.type in (TokenType.EQ, TokenType.NE, TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE):
             op_token = self.current_token
             op = {
-                TokenType.EQ: '==',
-                TokenType.NE: '!=',
-                TokenType.LT: '<',
-                TokenType.LE: '<=',
-                TokenType.GT: '>',
-                TokenType.GE: '>=',
+                TokenType.EQ: Operator.EQ,
+                TokenType.NE: Operator.NE,
+                TokenType.LT: Operator.LT,
+                TokenType.LE: Operator.LE,
+                TokenType.GT: Operator.GT,
+                TokenType.GE: Operator.GE,
             }[op_token.type]
             self.advance()
             right = self.parse_bitwise_or()
@@ -474,7 +482,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.PIPE:
             self.advance()
             right = self.parse_bitwise_xor()
-            left = BinaryOp(left, '|', right)
+            left = BinaryOp(left, Operator.BIT_OR, right)
         
         return left
 
@@ -485,7 +493,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.BIT_XOR:
             self.advance()
             right = self.parse_bitwise_and()
-            left = BinaryOp(left, '^', right)
+            left = BinaryOp(left, Operator.BIT_XOR, right)
         
         return left
 
@@ -496,7 +504,7 @@ class Parser:
         while self.current_token and self.current_token.type == TokenType.BIT_AND:
             self.advance()
             right = self.parse_shift()
-            left = BinaryOp(left, '&', right)
+            left = BinaryOp(left, Operator.BIT_AND, right)
         
         return left
 
@@ -505,7 +513,7 @@ class Parser:
         left = self.parse_additive()
         
         while self.current_token and self.current_token.type in (TokenType.LSHIFT, TokenType.RSHIFT):
-            op = '<<' if self.current_token.type == TokenType.LSHIFT else '>>'
+            op = Operator.LSHIFT if self.current_token.type == TokenType.LSHIFT else Operator.RSHIFT
             self.advance()
             right = self.parse_additive()
             left = BinaryOp(left, op, right)
@@ -517,7 +525,7 @@ class Parser:
         left = self.parse_multiplicative()
         
         while self.current_token and self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            op = '+' if self.current_token.type == TokenType.PLUS else '-'
+            op = Operator.ADD if self.current_token.type == TokenType.PLUS else Operator.SUB
             self.advance()
             right = self.parse_multiplicative()
             left = BinaryOp(left, op, right)
@@ -529,8 +537,8 @@ class Parser:
         left = self.parse_power()
         
         while self.current_token and self.current_token.type in (TokenType.STAR, TokenType.SLASH, TokenType.PERCENT):
-            op = '*' if self.current_token.type == TokenType.STAR else (
-                '/' if self.current_token.type == TokenType.SLASH else '%'
+            op = Operator.MUL if self.current_token.type == TokenType.STAR else (
+                Operator.DIV if self.current_token.type == TokenType.SLASH else Operator.MOD
             )
             self.advance()
             right = self.parse_power()
@@ -545,15 +553,15 @@ class Parser:
         if self.current_token and self.current_token.type == TokenType.POWER:
             self.advance()
             right = self.parse_power()  # Right associative
-            left = BinaryOp(left, '**', right)
+            left = BinaryOp(left, Operator.POW, right)
         
         return left
 
     def parse_unary(self) -> ASTNode:
         """Parse unary operators."""
         if self.current_token and self.current_token.type in (TokenType.MINUS, TokenType.PLUS, TokenType.BIT_NOT):
-            op = '-' if self.current_token.type == TokenType.MINUS else (
-                '+' if self.current_token.type == TokenType.PLUS else '~'
+            op = Operator.NEG if self.current_token.type == TokenType.MINUS else (
+                Operator.POS if self.current_token.type == TokenType.PLUS else Operator.INVERT
             )
             self.advance()
             operand = self.parse_unary()
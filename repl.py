@@ -101,8 +101,8 @@ def run_repl():
             # Uncomment for full traceback:
             # traceback.print_exc()
 
-def run_file(filename: str):
-    """Run a Sharp program file."""
+def run_file(filename: str, bytecode: bool = False):
+    """Run a Sharp program file, optionally on the bytecode VM."""
     try:
         with open(filename, 'r') as f:
             source = f.read()
@@ -123,7 +123,12 @@ def run_file(filename: str):
         
         # Interpret
         interpreter = Interpreter()
-        interpreter.interpret(ast)
+        if bytecode:
+            # JitVM is the plain VM unless Numba is installed
+            from vm import JitVM
+            JitVM(interpreter).run(ast)
+        else:
+            interpreter.interpret(ast)
     
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found")
@@ -137,9 +142,12 @@ def run_file(filename: str):
         sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    args = sys.argv[1:]
+    bytecode = '--bytecode' in args
+    args = [arg for arg in args if arg != '--bytecode']
+    if args:
         # Run file
-        run_file(sys.argv[1])
+        run_file(args[0], bytecode)
     else:
         # Run REPL
         run_repl()
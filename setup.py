@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Optional native build for Sharp.
+
+Sharp runs as plain Python. When Cython is installed,
+
+    python setup.py build_ext --inplace
+
+compiles ast_nodes.py in pure-Python mode into an extension module that is
+picked up ahead of the .py source. Without Cython this is a no-op build.
+
+With mypy installed, SHARP_NATIVE=mypyc selects mypyc instead; it compiles
+the node modules from their type annotations, so they must type-check:
+
+    SHARP_NATIVE=mypyc python setup.py build_ext --inplace
+"""
+
+import os
+from setuptools import setup
+
+# Modules compiled to extensions when a compiler is available
+NATIVE_MODULES = ["ast_nodes.py"]
+# mypyc only allows subclasses of compiled classes in compiled modules
+MYPYC_MODULES = ["ast_nodes.py", "ast_nodes_rare.py"]
+
+if os.environ.get("SHARP_NATIVE", "cython") == "mypyc":
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        ext_modules = []
+    else:
+        ext_modules = mypycify(MYPYC_MODULES)
+else:
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        ext_modules = []
+    else:
+        ext_modules = cythonize(NATIVE_MODULES, language_level=3)
+
+setup(
+    name="sharp",
+    py_modules=["ast_nodes", "ast_nodes_rare", "lexer", "parser", "interpreter", "stdlib", "bytecode", "vm", "repl"],
+    ext_modules=ext_modules,
+)
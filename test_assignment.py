@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Assignment kinds, including unpacking built directly as AST nodes
+"""
+
+from ast_nodes import Program, Assignment, AssignKind, ListLiteral, IntLiteral
+from interpreter import Interpreter, SharpRuntimeError
+
+def unpack(targets, count):
+    """Unpack a list of ``count`` ints into ``targets``; return the interpreter."""
+    values = ListLiteral([IntLiteral(i) for i in range(count)])
+    interpreter = Interpreter()
+    interpreter.interpret(Program([Assignment(AssignKind.UNPACK, targets, values)]))
+    return interpreter
+
+print("="*70)
+print("TESTING UNPACKING ASSIGNMENT")
+print("="*70)
+
+# Test 1: Exact-count unpacking
+print("\n1. Testing a, b, c = [0, 1, 2]...")
+try:
+    env = unpack(('a', 'b', 'c'), 3).global_env
+    assert (env.get('a'), env.get('b'), env.get('c')) == (0, 1, 2)
+    print("   ✅ Exact-count unpacking works!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 2: Wrong count without a starred target
+print("\n2. Testing a, b = [0, 1, 2]...")
+try:
+    unpack(('a', 'b'), 3)
+    print("   ❌ No error raised")
+except SharpRuntimeError as e:
+    assert str(e) == "Expected 2 values to unpack, got 3", e
+    print("   ✅ Count mismatch is reported!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 3: Starred target takes the middle
+print("\n3. Testing a, *rest, b = [0, 1, 2, 3]...")
+try:
+    env = unpack(('a', '*rest', 'b'), 4).global_env
+    assert (env.get('a'), env.get('rest'), env.get('b')) == (0, [1, 2], 3)
+    env = unpack(('a', '*rest', 'b'), 2).global_env
+    assert (env.get('a'), env.get('rest'), env.get('b')) == (0, [], 1)
+    print("   ✅ Starred unpacking works!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 4: Too few values for a starred target
+print("\n4. Testing a, *rest, b = [0]...")
+try:
+    unpack(('a', '*rest', 'b'), 1)
+    print("   ❌ No error raised")
+except SharpRuntimeError as e:
+    assert str(e) == "Not enough values to unpack (expected at least 2, got 1)", e
+    print("   ✅ Too few values are reported!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+print("\n" + "="*70)
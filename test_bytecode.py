@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test the Sharp bytecode compiler and VM against the tree-walking interpreter
+"""
+
+import contextlib
+import io
+import os
+import threading
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter, ProgramInterrupted
+from bytecode import Compiler, Op, VM
+
+def run(source, use_vm):
+    """Run source and return everything it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            ast = Parser(Lexer(source).tokenize()).parse()
+            if use_vm:
+                VM().run(ast)
+            else:
+                Interpreter().interpret(ast)
+        except Exception as e:
+            print(f"{type(e).__name__}: {e}")
+    return output.getvalue()
+
+print("="*70)
+print("TESTING BYTECODE VM")
+print("="*70)
+
+# Test 1: Compiled function body
+print("\n1. Testing compiled factorial...")
+code1 = """
+def factorial(n):
+    if n <= 1:
+        return 1
+    return n * factorial(n - 1)
+"""
+try:
+    ast = Parser(Lexer(code1).tokenize()).parse()
+    program = Compiler.compile_program(ast)
+    func_node, func_code = program.consts[0]
+    ops = [Op(func_code.code[ip]) for ip in range(0, len(func_code.code), 2)]
+    assert Op.EVAL not in ops, ops
+    assert ops.count(Op.CALL) == 1 and ops.count(Op.RETURN_VALUE) >= 2
+    assert run(code1 + "print(factorial(10))", True) == "3628800\n"
+    print("   ✅ factorial compiles to bytecode and runs!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 2: Loops, break and continue
+print("\n2. Testing loops with break/continue...")
+code2 = """
+total = 0
+for i in range(10):
+    if i == 2:
+        continue
+    if i == 7:
+        break
+    total = total + i
+n = 0
+while true:
+    n = n + 1
+    if n > 5:
+        break
+print(total, n)
+"""
+try:
+    assert run(code2, True) == run(code2, False) == "19 6\n"
+    print("   ✅ Loops match the interpreter!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 3: Nodes handed to the tree walker
+print("\n3. Testing fallback to the interpreter...")
+code3 = """
+def first_big(items):
+    for item in items:
+        try:
+            if item > 2:
+                return item
+        except:
+            pass
+    return nil
+squares = [x * x for x in range(5)]
+print(first_big(squares), squares)
+"""
+try:
+    assert run(code3, True) == run(code3, False)
+    print("   ✅ Fallback nodes match the interpreter!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 4: Example programs give identical output
+print("\n4. Testing example programs...")
+examples_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'examples')
+skipped = ('gui_', 'timer', 'temp_converter', 'network_app', 'weather_app', 'calc_app', 'todo_app')
+mismatched = []
+count = 0
+for filename in sorted(os.listdir(examples_dir)):
+    if not filename.endswith('.sharp') or filename.startswith(skipped) or 'timer' in filename:
+        continue
+    with open(os.path.join(examples_dir, filename), 'r', encoding='utf-8') as f:
+        source = f.read()
+    count += 1
+    if run(source, True) != run(source, False):
+        mismatched.append(filename)
+if mismatched:
+    print(f"   ❌ Output differs for: {', '.join(mismatched)}")
+else:
+    print(f"   ✅ {count} example programs match the interpreter!")
+
+# Test 5: Stop requests end loops and sleeps in the VM
+print("\n5. Testing interrupting a running program...")
+code5 = {
+    "loop": "let i = 0\nwhile true:\n    i = i + 1\n",
+    "calls": "def spin(n):\n    return n\nwhile true:\n    spin(1)\n",
+    "sleep": "sleep(60)\n",
+}
+try:
+    for name, source in code5.items():
+        vm = VM()
+        timer = threading.Timer(0.1, vm.interpreter.request_interrupt)
+        timer.start()
+        try:
+            vm.run(Parser(Lexer(source).tokenize()).parse())
+            raise AssertionError(f"{name} ran to completion")
+        except ProgramInterrupted:
+            pass
+        finally:
+            timer.cancel()
+    print("   ✅ Loops, calls and sleep stop when interrupted!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+print("\n" + "="*70)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the numeric lowering used by the JIT VM (runs without Numba too)
+"""
+
+import contextlib
+import io
+from lexer import Lexer
+from parser import Parser
+from bytecode import Compiler, VM
+from vm import JitVM, lower
+
+def run(source, vm):
+    """Run source on ``vm`` and return everything it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            vm.run(Parser(Lexer(source).tokenize()).parse())
+        except Exception as e:
+            print(f"{type(e).__name__}: {e}")
+    return output.getvalue()
+
+def lowered(source):
+    """Lower the first function defined in source."""
+    program = Compiler.compile_program(Parser(Lexer(source).tokenize()).parse())
+    func_node, func_code = program.consts[0]
+    return lower(func_code, func_node.params)
+
+print("="*70)
+print("TESTING JIT VM")
+print("="*70)
+
+# Test 1: Integer loops are lowered, everything else is not
+print("\n1. Testing which functions qualify...")
+try:
+    assert lowered("""
+def sum_to(n):
+    let total = 0
+    let i = 0
+    while i < n:
+        i = i + 1
+        if i % 3 == 0:
+            continue
+        total = total + i
+    return total
+""") is not None
+    assert lowered("def fact(n):\n    return n * fact(n - 1)\n") is None
+    assert lowered("def greet(name):\n    return \"hi \" + name\n") is None
+    assert lowered("def flag(n):\n    return n > 1\n") is None
+    print("   ✅ Only call-free integer code is lowered!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 2: Results match the plain VM
+print("\n2. Testing results against the VM...")
+code2 = """
+def collatz(n):
+    let steps = 0
+    while n != 1:
+        if n % 2 == 0:
+            n = n / 2
+        else:
+            n = 3 * n + 1
+        steps = steps + 1
+        if steps > 1000:
+            break
+    return steps
+def nothing(n):
+    let x = n
+print(collatz(27), collatz(97), nothing(3))
+print(collatz("x"))
+"""
+try:
+    expected = run(code2, VM())
+    assert run(code2, JitVM(jit=True)) == expected, expected
+    print("   ✅ JIT VM output matches the VM!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+# Test 3: Overflow and errors fall back to the Python VM
+print("\n3. Testing fallback on overflow and division by zero...")
+code3 = """
+def power(base, exp):
+    let result = 1
+    while exp > 0:
+        result = result * base
+        exp = exp - 1
+    return result
+def ratio(a, b):
+    return a / b
+print(power(2, 62), power(2, 64), power(-2, 63))
+print(ratio(7, 0))
+"""
+try:
+    expected = run(code3, VM())
+    assert run(code3, JitVM(jit=True)) == expected, expected
+    assert "18446744073709551616" in expected
+    print("   ✅ Bail-outs give the same results as the VM!")
+except Exception as e:
+    print(f"   ❌ Error: {e}")
+
+print("\n" + "="*70)
@@ -3,6 +3,7 @@
 VERIFICATION - All 27 new keywords are REAL and in the code
 """
 
+import re
 import sys
 
 print("="*70)
@@ -57,7 +58,7 @@ with open("interpreter.py", "r") as f:
 
 required_interpreter_methods = [
     "eval_class_def", "eval_try_stmt", "eval_raise_stmt", "eval_with_stmt",
-    "eval_yield_stmt", "eval_async_function_def", "eval_decorated_function",
+    "eval_yield_stmt", "eval_function_def", "eval_decorated_function",
     "eval_decorated_class", "eval_async_for_loop", "eval_async_with_stmt",
     "eval_await_expr"
 ]
@@ -70,17 +71,35 @@ for method in required_interpreter_methods:
     else:
         print(f"   ❌ {method:30} - NOT FOUND")
 
-print(f"\n   Interpreter Methods: {interpreter_methods_found}/{len(required_interpreter_methods)}")
+# Async, decorated and method defs are FunctionDef nodes; check that the
+# interpreter looks at what tells them apart
+required_interpreter_handling = {
+    "async def (is_async)": ".is_async",
+    "decorated def (decorators)": "if node.decorators:",
+    "method def (in class body)": "isinstance(stmt, FunctionDef)",
+}
+
+for label, marker in required_interpreter_handling.items():
+    if marker in interpreter_code:
+        print(f"   ✅ {label:30} - HANDLED in interpreter.py")
+        interpreter_methods_found += 1
+    else:
+        print(f"   ❌ {label:30} - NOT HANDLED")
+
+interpreter_required = len(required_interpreter_methods) + len(required_interpreter_handling)
+print(f"\n   Interpreter Methods: {interpreter_methods_found}/{interpreter_required}")
 
 # 4. Check AST NODES
 print("\n4. CHECKING AST_NODES.PY for new node types...")
 with open("ast_nodes.py", "r") as f:
     ast_code = f.read()
+with open("ast_nodes_rare.py", "r") as f:
+    ast_code += f.read()
 
 required_ast_nodes = [
-    "ClassDef", "MethodDef", "TryStmt", "ExceptHandler", "RaiseStmt",
-    "WithStmt", "YieldStmt", "AsyncFunctionDef", "AwaitExpr", "Decorator",
-    "DecoratedFunction", "DecoratedClass", "AsyncForLoop", "AsyncWithStmt"
+    "ClassDef", "FunctionDef", "TryStmt", "ExceptHandler", "RaiseStmt",
+    "WithStmt", "YieldStmt", "AwaitExpr", "Decorator",
+    "DecoratedClass", "AsyncForLoop", "AsyncWithStmt"
 ]
 
 ast_nodes_found = 0
@@ -91,7 +110,23 @@ for node in required_ast_nodes:
     else:
         print(f"   ❌ {node:25} - NOT FOUND")
 
-print(f"\n   AST Nodes: {ast_nodes_found}/{len(required_ast_nodes)}")
+# The former AsyncFunctionDef and DecoratedFunction nodes are FunctionDef fields
+function_def = re.search(r"class FunctionDef\(ASTNode\):(.*?)\n\n", ast_code, re.DOTALL)
+function_def_code = function_def.group(1) if function_def else ""
+required_function_def_fields = {
+    "AsyncFunctionDef": "is_async: bool",
+    "DecoratedFunction": "decorators: Tuple",
+}
+
+for node, field in required_function_def_fields.items():
+    if field in function_def_code:
+        print(f"   ✅ {node:25} - FOUND as FunctionDef.{field.split(':')[0]}")
+        ast_nodes_found += 1
+    else:
+        print(f"   ❌ {node:25} - NOT FOUND")
+
+ast_nodes_required = len(required_ast_nodes) + len(required_function_def_fields)
+print(f"\n   AST Nodes: {ast_nodes_found}/{ast_nodes_required}")
 
 # 5. Check GUI autocompletion
 print("\n5. CHECKING GUI.PY for autocompletion keywords...")
@@ -119,7 +154,7 @@ print("FINAL SUMMARY")
 print("="*70)
 
 total_required = len(required_tokens) + len(required_parser_methods) + \
-                 len(required_interpreter_methods) + len(required_ast_nodes) + \
+                 interpreter_required + ast_nodes_required + \
                  len(autocompletion_keywords)
 
 total_found = lexer_tokens_found + parser_methods_found + \
@@ -91,7 +91,7 @@ interpreter_handled = {
     'while': 'eval_while_loop' in interpreter_code,
     'for': 'eval_for_loop' in interpreter_code,
     'return': 'eval_return' in interpreter_code or 'TokenType.RETURN' in interpreter_code,
-    'async': 'eval_async_function_def' in interpreter_code,
+    'async': 'def eval_function_def' in interpreter_code and '.is_async' in interpreter_code,
     'await': 'eval_await_expr' in interpreter_code,
     'try': 'eval_try_stmt' in interpreter_code,
     'except': 'eval_try_stmt' in interpreter_code,
@@ -0,0 +1,270 @@
+"""
+Native dispatch loop for numeric Sharp functions.
+
+Compiled functions whose bytecode only moves integers between local
+variables (arithmetic, comparisons, while loops and returns) are lowered to
+flat int64 arrays and run by ``run_numeric``. When Numba is installed the
+loop is compiled with ``@njit(cache=True)``; without it JitVM behaves exactly
+like VM.
+
+Anything the loop cannot represent exactly (overflow past 64 bits, division
+by zero, reading an unset variable) makes it bail out, and the call is run
+again on the Python VM. Lowered functions never call out or write outside
+their own locals, so running them twice is safe.
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional
+from ast_nodes import Operator
+from bytecode import (
+    VM, CodeObject, CompiledFunction,
+    LOAD_CONST, LOAD_NIL, LOAD_NAME, STORE_NAME, SET_NAME, POP, BINARY_OP,
+    UNARY_OP, JUMP, POP_JUMP_IF_FALSE, RETURN_VALUE, SETUP_LOOP, POP_LOOP,
+    BREAK_LOOP, CONTINUE_LOOP,
+)
+from stdlib import SharpNil
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# Status codes returned by run_numeric
+RETURNED = 0
+RETURNED_NIL = 1
+BAILED = 2
+
+ADD = int(Operator.ADD)
+SUB = int(Operator.SUB)
+MUL = int(Operator.MUL)
+DIV = int(Operator.DIV)
+MOD = int(Operator.MOD)
+EQ = int(Operator.EQ)
+NE = int(Operator.NE)
+LT = int(Operator.LT)
+LE = int(Operator.LE)
+GT = int(Operator.GT)
+GE = int(Operator.GE)
+POS = int(Operator.POS)
+NEG = int(Operator.NEG)
+
+ARITHMETIC_OPS = frozenset((ADD, SUB, MUL, DIV, MOD))
+# Comparison results are only valid as jump conditions (they are ints here,
+# bools in Sharp), so lowering requires POP_JUMP_IF_FALSE right after them
+COMPARISON_OPS = frozenset((EQ, NE, LT, LE, GT, GE))
+
+class NumericCode:
+    """A CodeObject lowered for run_numeric.
+
+    Names become slot indexes, with the parameters in the first slots, and
+    loop control is resolved to plain jumps.
+    """
+    __slots__ = ('code', 'consts', 'nslots', 'nparams', 'stack_size')
+
+    def __init__(self, code: array, consts: array, nslots: int, nparams: int):
+        self.code = code
+        self.consts = consts
+        self.nslots = nslots
+        self.nparams = nparams
+        # Each instruction pushes at most one value
+        self.stack_size = len(code) // 2 + 1
+
+def lower(co: CodeObject, params: List[str]) -> Optional[NumericCode]:
+    """Lower ``co`` for run_numeric, or return None if it does not qualify."""
+    code = co.code
+    size = len(code)
+    local_names = set(params)
+    for ip in range(0, size, 2):
+        if code[ip] == STORE_NAME:
+            local_names.add(co.names[code[ip + 1]])
+    slots = {name: i for i, name in enumerate(params)}
+    for name in co.names:
+        if name in local_names and name not in slots:
+            slots[name] = len(slots)
+
+    consts: List[int] = []
+    const_ids: Dict[int, int] = {}
+    lowered = array('q')
+    loop_stack: List[int] = []
+    for ip in range(0, size, 2):
+        op = code[ip]
+        arg = code[ip + 1]
+        next_op = code[ip + 2] if ip + 2 < size else -1
+
+        if op == LOAD_CONST:
+            value = co.consts[arg]
+            if type(value) is not int or not INT64_MIN <= value <= INT64_MAX:
+                return None
+            if arg not in const_ids:
+                const_ids[arg] = len(consts)
+                consts.append(value)
+            arg = const_ids[arg]
+        elif op == LOAD_NAME or op == STORE_NAME or op == SET_NAME:
+            name = co.names[arg]
+            if name not in local_names:
+                return None
+            arg = slots[name]
+        elif op == BINARY_OP:
+            if arg in COMPARISON_OPS:
+                if next_op != POP_JUMP_IF_FALSE:
+                    return None
+            elif arg not in ARITHMETIC_OPS:
+                return None
+        elif op == UNARY_OP:
+            if arg != POS and arg != NEG:
+                return None
+        elif op == LOAD_NIL:
+            # Only the implicit "return nil" at the end of a body
+            if next_op != RETURN_VALUE:
+                return None
+        elif op == SETUP_LOOP:
+            loop_stack.append(arg)
+        elif op == POP_LOOP:
+            loop_stack.pop()
+        elif op == BREAK_LOOP or op == CONTINUE_LOOP:
+            continue_ip, break_ip, _ = co.loops[loop_stack[-1]]
+            op, arg = JUMP, (break_ip if op == BREAK_LOOP else continue_ip)
+        elif op not in (POP, JUMP, POP_JUMP_IF_FALSE, RETURN_VALUE):
+            return None
+        lowered.append(op)
+        lowered.append(arg)
+
+    return NumericCode(lowered, array('q', consts), len(slots), len(params))
+
+def run_numeric(code, consts, slots, defined, stack):
+    """Run lowered code; returns a ``(status, value)`` pair.
+
+    Written in the subset Numba compiles: int arrays in, ints out. Overflow
+    is checked before each operation so the result is the same whether the
+    loop runs as Python or as machine code.
+    """
+    sp = 0
+    ip = 0
+    while True:
+        op = code[ip]
+        arg = code[ip + 1]
+        ip += 2
+
+        if op == LOAD_NAME:
+            if not defined[arg]:
+                return BAILED, 0
+            stack[sp] = slots[arg]
+            sp += 1
+        elif op == LOAD_CONST:
+            stack[sp] = consts[arg]
+            sp += 1
+        elif op == BINARY_OP:
+            sp -= 1
+            b = stack[sp]
+            a = stack[sp - 1]
+            if arg == ADD:
+                if (b > 0 and a > INT64_MAX - b) or (b < 0 and a < INT64_MIN - b):
+                    return BAILED, 0
+                r = a + b
+            elif arg == SUB:
+                if (b < 0 and a > INT64_MAX + b) or (b > 0 and a < INT64_MIN + b):
+                    return BAILED, 0
+                r = a - b
+            elif arg == MUL:
+                # Ceiling divisions are written as (x + d - 1) // d for d > 0
+                if a > 0:
+                    if b > 0:
+                        if a > INT64_MAX // b:
+                            return BAILED, 0
+                    elif b < (INT64_MIN + a - 1) // a:
+                        return BAILED, 0
+                elif a < 0:
+                    if b > 0:
+                        if a < (INT64_MIN + b - 1) // b:
+                            return BAILED, 0
+                    elif b < 0 and (a == INT64_MIN or b < -(INT64_MAX // -a)):
+                        return BAILED, 0
+                r = a * b
+            elif arg == DIV or arg == MOD:
+                if b == 0 or (a == INT64_MIN and b == -1):
+                    return BAILED, 0
+                r = a // b if arg == DIV else a % b
+            elif arg == EQ:
+                r = 1 if a == b else 0
+            elif arg == NE:
+                r = 1 if a != b else 0
+            elif arg == LT:
+                r = 1 if a < b else 0
+            elif arg == LE:
+                r = 1 if a <= b else 0
+            elif arg == GT:
+                r = 1 if a > b else 0
+            else:
+                r = 1 if a >= b else 0
+            stack[sp - 1] = r
+        elif op == POP_JUMP_IF_FALSE:
+            sp -= 1
+            if stack[sp] == 0:
+                ip = arg
+        elif op == JUMP:
+            ip = arg
+        elif op == STORE_NAME or op == SET_NAME:
+            if op == SET_NAME and not defined[arg]:
+                return BAILED, 0
+            sp -= 1
+            slots[arg] = stack[sp]
+            defined[arg] = 1
+        elif op == POP:
+            sp -= 1
+        elif op == UNARY_OP:
+            if arg == NEG:
+                if stack[sp - 1] == INT64_MIN:
+                    return BAILED, 0
+                stack[sp - 1] = -stack[sp - 1]
+        elif op == RETURN_VALUE:
+            return RETURNED, stack[sp - 1]
+        elif op == LOAD_NIL:
+            return RETURNED_NIL, 0
+        # SETUP_LOOP and POP_LOOP need no work once loop control is lowered
+
+if NUMBA_AVAILABLE:
+    _native_run = njit(cache=True)(run_numeric)
+else:
+    _native_run = None
+
+class JitVM(VM):
+    """VM that runs qualifying integer functions through run_numeric.
+
+    ``jit`` defaults to on when Numba is available. Turning it on without
+    Numba runs the same loop as plain Python, which is only useful for
+    testing the lowering.
+    """
+
+    def __init__(self, interpreter=None, jit: bool = NUMBA_AVAILABLE):
+        super().__init__(interpreter)
+        self.jit = jit
+        self._run_numeric = _native_run or run_numeric
+        self._lowered: Dict[CodeObject, Optional[NumericCode]] = {}
+
+    def call(self, func: CompiledFunction, args: List[Any], kwargs: dict) -> Any:
+        """Call a compiled function, natively when it qualifies."""
+        if self.jit and not kwargs and len(args) == len(func.params):
+            co = func.code
+            if co in self._lowered:
+                numeric = self._lowered[co]
+            else:
+                numeric = self._lowered[co] = lower(co, func.params)
+            if numeric is not None and all(
+                    type(a) is int and INT64_MIN <= a <= INT64_MAX for a in args):
+                slots = array('q', args)
+                slots.extend([0] * (numeric.nslots - numeric.nparams))
+                defined = array('b', [1] * numeric.nparams)
+                defined.extend([0] * (numeric.nslots - numeric.nparams))
+                stack = array('q', [0] * numeric.stack_size)
+                status, value = self._run_numeric(numeric.code, numeric.consts,
+                                                  slots, defined, stack)
+                if status == RETURNED:
+                    return value
+                if status == RETURNED_NIL:
+                    return SharpNil()
+        return super().call(func, args, kwargs)